@@ -0,0 +1,467 @@
+"""
+Benchmark for the image resizer.
+
+Generates synthetic images and measures resize_image latency and
+batch_resize_images throughput under different settings. Results are
+written as JSON so runs can be compared across releases.
+
+Example:
+  python benchmark.py --image-sizes 1920x1080 4000x3000 --formats JPEG PNG \
+      --workers 1 4 --output bench.json
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import PIL
+from PIL import Image
+
+from image_resizer import (ENCODE_PROFILES, PRESETS, RESAMPLE_FILTERS,
+                           SUPPORTED_OUTPUT_FORMATS,
+                           _build_output_path, _flatten_alpha,
+                           batch_resize_images, resize_image)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Source formats that can carry an alpha band
+ALPHA_FORMATS = ('PNG', 'WEBP', 'TIFF')
+
+
+def synthetic_image(width, height, transparent=False):
+    """
+    Build a synthetic test image.
+
+    Gradients combined with noise compress like photos rather than flat
+    colour.
+
+    Args:
+        width (int): Image width
+        height (int): Image height
+        transparent (bool): Add a gradient alpha band (RGBA)
+
+    Returns:
+        PIL.Image.Image: RGB or RGBA image
+    """
+    red = Image.linear_gradient('L').resize((width, height))
+    green = Image.effect_noise((width, height), 64)
+    blue = Image.radial_gradient('L').resize((width, height))
+    if not transparent:
+        return Image.merge('RGB', (red, green, blue))
+    alpha = red.transpose(Image.Transpose.ROTATE_90).resize((width, height))
+    return Image.merge('RGBA', (red, green, blue, alpha))
+
+
+def generate_images(folder, image_sizes, formats, count, transparent=False):
+    """
+    Write synthetic test images for every size/format combination.
+
+    Args:
+        folder (str): Folder to create the images in
+        image_sizes (list): (width, height) tuples
+        formats (list): Image formats (e.g. 'JPEG', 'PNG')
+        count (int): Images per size/format combination
+        transparent (bool): Give images an alpha band where the format
+            supports it
+
+    Returns:
+        dict: Lists of image paths keyed by (format, (width, height))
+    """
+    images = {}
+    for image_format, (width, height) in itertools.product(formats, image_sizes):
+        subfolder = os.path.join(folder, f"{image_format.lower()}_{width}x{height}")
+        os.makedirs(subfolder, exist_ok=True)
+
+        img = synthetic_image(width, height,
+                              transparent and image_format in ALPHA_FORMATS)
+
+        ext = '.jpg' if image_format == 'JPEG' else f'.{image_format.lower()}'
+        paths = []
+        for index in range(count):
+            path = os.path.join(subfolder, f"bench_{index:04d}{ext}")
+            img.save(path, format=image_format)
+            paths.append(path)
+        images[(image_format, (width, height))] = paths
+    return images
+
+
+def percentile(values, pct):
+    """
+    Return the pct-th percentile of values using linear interpolation.
+
+    Args:
+        values (list): Sample values
+        pct (float): Percentile (0-100)
+
+    Returns:
+        float: Percentile value, or None for an empty sample
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def peak_rss_mb():
+    """
+    Return the peak resident set size of this process and its children.
+
+    Returns:
+        float: Peak RSS in MB, or None where the resource module is missing
+    """
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    self_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    child_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round(max(self_rss, child_rss) * 1024 / scale / 1024, 1)
+
+
+def _run_measured(start_method, function, *args):
+    """Run a benchmark function and add the peak RSS of its process."""
+    # Children inherit the forkserver start method; restore the caller's so
+    # batch workers are this process's children and count towards its peak
+    multiprocessing.set_start_method(start_method, force=True)
+    return {**function(*args), "peak_rss_mb": peak_rss_mb()}
+
+
+def measure_in_subprocess(function, *args):
+    """
+    Run a benchmark function in a fresh interpreter.
+
+    ru_maxrss is a lifetime high-water mark, so measured in one long-lived
+    process every scenario after the largest would repeat its peak. Each
+    scenario runs in a process forked from a fresh forkserver (a spawned
+    process would inherit the parent's peak across exec), so each result
+    gets its own peak_rss_mb.
+
+    Args:
+        function (callable): Module-level benchmark function
+        *args: Its arguments
+
+    Returns:
+        dict: The function's result plus 'peak_rss_mb'
+    """
+    start_method = multiprocessing.get_start_method()
+    context = multiprocessing.get_context(
+        'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods()
+        else 'spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(_run_measured, start_method, function, *args).result()
+
+
+def benchmark_resize_image(paths, output_folder, settings):
+    """
+    Time resize_image on each image individually.
+
+    Args:
+        paths (list): Input image paths
+        output_folder (str): Folder for the resized images
+        settings (dict): Keyword arguments for resize_image
+
+    Returns:
+        dict: Throughput, latency percentiles and output size
+    """
+    os.makedirs(output_folder, exist_ok=True)
+    latencies = []
+    megapixels = 0.0
+    failed = 0
+    bytes_out = 0
+
+    for path in paths:
+        with Image.open(path) as img:
+            megapixels += img.width * img.height / 1e6
+        output_path = _build_output_path(path, output_folder,
+                                         settings.get('output_format'))
+        start = time.perf_counter()
+        ok = resize_image(path, output_path, quiet=True, **settings)
+        latencies.append(time.perf_counter() - start)
+        if ok:
+            bytes_out += os.path.getsize(output_path)
+        else:
+            failed += 1
+
+    elapsed = sum(latencies)
+    return {
+        "images": len(paths),
+        "failed": failed,
+        "seconds": round(elapsed, 4),
+        "images_per_sec": round(len(paths) / elapsed, 2) if elapsed else None,
+        "mp_per_sec": round(megapixels / elapsed, 2) if elapsed else None,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+        },
+        "bytes_out": bytes_out,
+    }
+
+
+def benchmark_batch(input_folder, output_folder, megapixels, settings, workers):
+    """
+    Time batch_resize_images over a folder.
+
+    Args:
+        input_folder (str): Folder of input images
+        output_folder (str): Folder for the resized images
+        megapixels (float): Total source megapixels in input_folder
+        settings (dict): Keyword arguments for batch_resize_images
+        workers (int): Number of worker processes
+
+    Returns:
+        dict: Throughput figures
+    """
+    start = time.perf_counter()
+    # Silence the batch header and summary as well as per-image lines
+    with contextlib.redirect_stdout(io.StringIO()):
+        stats = batch_resize_images(input_folder, output_folder, workers=workers,
+                                    quiet=True, **settings)
+    elapsed = time.perf_counter() - start
+    return {
+        "images": stats["total"],
+        "failed": stats["failed"],
+        "seconds": round(elapsed, 4),
+        "images_per_sec": round(stats["total"] / elapsed, 2) if elapsed else None,
+        "mp_per_sec": round(megapixels / elapsed, 2) if elapsed else None,
+    }
+
+
+def _flatten_split_paste(img, background=(255, 255, 255)):
+    """
+    Reference flatten used before the single-pass path: split the bands
+    and paste with the extracted alpha as mask.
+    """
+    flattened = Image.new('RGB', img.size, background)
+    flattened.paste(img, mask=img.split()[-1])
+    return flattened
+
+
+def benchmark_flatten(image_sizes, repeats=10):
+    """
+    Compare alpha flattening for JPEG output against the split-and-paste
+    reference on transparent images.
+
+    Args:
+        image_sizes (list): (width, height) tuples
+        repeats (int): Timed runs per size
+
+    Returns:
+        list: Per-size median timings in milliseconds
+    """
+    results = []
+    for width, height in image_sizes:
+        img = synthetic_image(width, height, transparent=True)
+        img.load()
+
+        timings = {}
+        for name, flatten in (("split_paste", _flatten_split_paste),
+                              ("single_pass", _flatten_alpha)):
+            samples = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                flatten(img)
+                samples.append(time.perf_counter() - start)
+            timings[name] = percentile(samples, 50) * 1000
+
+        results.append({
+            "size": f"{width}x{height}",
+            "split_paste_ms": round(timings["split_paste"], 3),
+            "single_pass_ms": round(timings["single_pass"], 3),
+            "saved_ms_per_image": round(timings["split_paste"] - timings["single_pass"], 3),
+        })
+    return results
+
+
+def run_benchmarks(image_sizes, formats, count, target_width, output_formats,
+                   qualities, reducing_gaps, workers_list, drafts,
+                   transparent=False, resamples=('lanczos',), presets=None,
+                   encode_speeds=('default',)):
+    """
+    Run the full benchmark matrix.
+
+    Args:
+        image_sizes (list): Source (width, height) tuples
+        formats (list): Source image formats
+        count (int): Images per size/format combination
+        target_width (int): Resize target width
+        output_formats (list): Output formats (None = same as source)
+        qualities (list): JPEG/WebP quality values
+        reducing_gaps (list): reducing_gap values (None = single pass)
+        workers_list (list): Worker counts for the batch runs
+        drafts (list): JPEG draft-mode settings
+        transparent (bool): Use transparent sources and also time alpha
+            flattening on its own
+        resamples (list): Resampling filter names
+        presets (list): Preset names; replaces the resamples x
+            reducing_gaps matrix with each preset's filter and gap
+        encode_speeds (list): Encoder profile names
+
+    Returns:
+        dict: Environment description and one result per scenario
+    """
+    results = []
+
+    if presets:
+        strategies = [(name, PRESETS[name]['resample'], PRESETS[name]['reducing_gap'])
+                      for name in presets]
+    else:
+        strategies = [(None, resample, reducing_gap) for resample, reducing_gap
+                      in itertools.product(resamples, reducing_gaps)]
+
+    with tempfile.TemporaryDirectory(prefix='image_resizer_bench_') as temp_dir:
+        source_folder = os.path.join(temp_dir, 'source')
+        images = generate_images(source_folder, image_sizes, formats, count,
+                                 transparent)
+
+        for (image_format, size), paths in images.items():
+            input_folder = os.path.dirname(paths[0])
+            megapixels = size[0] * size[1] * len(paths) / 1e6
+
+            for output_format, quality, strategy, draft, encode_speed in itertools.product(
+                    output_formats, qualities, strategies, drafts, encode_speeds):
+                preset, resample, reducing_gap = strategy
+                settings = {
+                    "width": target_width,
+                    "quality": quality,
+                    "output_format": output_format,
+                    "draft": draft,
+                    "resample": resample,
+                    "reducing_gap": reducing_gap,
+                    "encode_speed": encode_speed,
+                }
+                scenario = {
+                    "source_format": image_format,
+                    "source_size": f"{size[0]}x{size[1]}",
+                    **({"preset": preset} if preset else {}),
+                    **settings,
+                }
+                output_folder = os.path.join(temp_dir, 'out', str(len(results)))
+
+                single = measure_in_subprocess(benchmark_resize_image, paths,
+                                               output_folder, settings)
+                results.append({**scenario, "mode": "resize_image", "workers": 1,
+                                **single})
+
+                for workers in workers_list:
+                    batch = measure_in_subprocess(benchmark_batch, input_folder,
+                                                  output_folder, megapixels,
+                                                  settings, workers)
+                    results.append({**scenario, "mode": "batch_resize_images",
+                                    "workers": workers, **batch})
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "pillow": PIL.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+    if transparent:
+        report["flatten"] = benchmark_flatten(image_sizes)
+    return report
+
+
+def _parse_image_size(text):
+    """Parse a WIDTHxHEIGHT argument."""
+    try:
+        width, height = (int(part) for part in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid size '{text}' (expected WIDTHxHEIGHT)")
+    return width, height
+
+
+def _parse_optional(cast):
+    """Build an argparse type that maps 'none' to None."""
+    def parse(text):
+        return None if text.lower() == 'none' else cast(text)
+    return parse
+
+
+def main():
+    """Main function to handle command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark decode/resize/encode throughput of the image resizer")
+    parser.add_argument('--image-sizes', nargs='+', type=_parse_image_size,
+                        default=[(1920, 1080), (4000, 3000)],
+                        help='Source image sizes (default: 1920x1080 4000x3000)')
+    parser.add_argument('--formats', nargs='+', default=['JPEG', 'PNG'],
+                        choices=SUPPORTED_OUTPUT_FORMATS,
+                        help='Source image formats (default: JPEG PNG)')
+    parser.add_argument('--count', type=int, default=10,
+                        help='Images per size/format combination (default: 10)')
+    parser.add_argument('--target-width', type=int, default=300,
+                        help='Resize target width (default: 300)')
+    parser.add_argument('--output-formats', nargs='+', default=[None],
+                        type=_parse_optional(str.upper),
+                        help="Output formats, 'none' = same as source (default: none)")
+    parser.add_argument('--qualities', nargs='+', type=int, default=[85],
+                        help='Quality values (default: 85)')
+    parser.add_argument('--reducing-gaps', nargs='+', type=_parse_optional(float),
+                        default=[None],
+                        help="reducing_gap values, 'none' = single pass (default: none)")
+    parser.add_argument('--filters', nargs='+', default=['lanczos'],
+                        choices=list(RESAMPLE_FILTERS),
+                        help='Resampling filters (default: lanczos)')
+    parser.add_argument('--presets', nargs='+', choices=list(PRESETS),
+                        help='Benchmark these presets instead of the '
+                             '--filters x --reducing-gaps matrix')
+    parser.add_argument('--encode-speeds', nargs='+', default=['default'],
+                        choices=list(ENCODE_PROFILES),
+                        help='Encoder profiles (default: default)')
+    parser.add_argument('--workers', nargs='+', type=int, default=[1, os.cpu_count() or 1],
+                        help='Worker counts for batch runs (default: 1 and CPU count)')
+    parser.add_argument('--no-draft', action='store_true',
+                        help='Also benchmark with JPEG draft decoding disabled')
+    parser.add_argument('--transparent', action='store_true',
+                        help='Give PNG/WebP/TIFF sources an alpha band and time '
+                             'alpha flattening separately')
+    parser.add_argument('--output',
+                        help='Write JSON results to this file instead of stdout')
+
+    args = parser.parse_args()
+
+    report = run_benchmarks(
+        image_sizes=args.image_sizes,
+        formats=args.formats,
+        count=args.count,
+        target_width=args.target_width,
+        output_formats=args.output_formats,
+        qualities=args.qualities,
+        reducing_gaps=args.reducing_gaps,
+        workers_list=sorted(set(args.workers)),
+        drafts=[True, False] if args.no_draft else [True],
+        transparent=args.transparent,
+        resamples=args.filters,
+        presets=args.presets,
+        encode_speeds=args.encode_speeds
+    )
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Benchmark results written to '{args.output}'")
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -46,5 +46,15 @@ batch_resize_images(
     output_format="WEBP"
 )
 
+# Example 5: Create several sizes from a single decode per image
+print("\n" + "="*60)
+print("Example 5: Multiple renditions")
+batch_resize_images(
+    input_folder="sample_images",
+    output_folder="output/renditions",
+    sizes=[(1920, None), (1200, None), (800, None), (300, None, "JPEG")],
+    quality=85
+)
+
 print("\n" + "="*60)
 print("All examples completed!")
@@ -10,130 +10,2269 @@ Features:
 """
 
 import os
-from PIL import Image
+from PIL import Image, ImageColor, ImageSequence, TiffImagePlugin
 import argparse
+import asyncio
+import contextlib
+import functools
+import hashlib
+import io
+import itertools
+import json
+import math
+import mmap
+import shutil
+import time
+from collections import deque, namedtuple
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
 from pathlib import Path
 
 
-def get_images_from_folder(folder_path, extensions=None):
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff', '.webp']
+SUPPORTED_OUTPUT_FORMATS = ['JPEG', 'PNG', 'BMP', 'WEBP', 'TIFF']
+
+# Most images per task submitted to the process pool while the batch is
+# still being discovered (chunks start at one image; see _iter_chunks)
+DEFAULT_CHUNKSIZE = 8
+
+# Incremental mode keeps this manifest in the output folder
+MANIFEST_FILENAME = '.image_resizer_manifest.json'
+MANIFEST_VERSION = 1
+
+# Default size limit of the content-addressed output cache (1 GiB)
+DEFAULT_CACHE_MAX_BYTES = 1024 ** 3
+
+# Color transparent areas are flattened onto for formats without alpha
+DEFAULT_BACKGROUND = (255, 255, 255)
+
+# Output formats that cannot store transparency
+NO_ALPHA_FORMATS = ('JPEG', 'JPG')
+
+# Modes that may carry transparency
+ALPHA_MODES = ('RGBA', 'LA', 'PA', 'P')
+
+# Resampling filters by name, fastest first
+RESAMPLE_FILTERS = {
+    'nearest': Image.Resampling.NEAREST,
+    'box': Image.Resampling.BOX,
+    'bilinear': Image.Resampling.BILINEAR,
+    'hamming': Image.Resampling.HAMMING,
+    'bicubic': Image.Resampling.BICUBIC,
+    'lanczos': Image.Resampling.LANCZOS,
+}
+DEFAULT_RESAMPLE = 'lanczos'
+
+# Filter and reducing strategy picked together by --preset
+PRESETS = {
+    'fast': {'resample': 'bilinear', 'reducing_gap': 2.0},
+    'balanced': {'resample': 'bicubic', 'reducing_gap': 3.0},
+    'best': {'resample': 'lanczos', 'reducing_gap': None},
+}
+
+# Encoder save() options per output format, trading encode time for size
+ENCODE_PROFILES = {
+    'fast': {
+        'JPEG': {'optimize': False, 'progressive': False, 'subsampling': '4:2:0'},
+        'PNG': {'compress_level': 1},
+        'WEBP': {'method': 0},
+    },
+    'default': {
+        'JPEG': {'optimize': True},
+    },
+    'small': {
+        'JPEG': {'optimize': True, 'progressive': True},
+        'PNG': {'optimize': True},
+        'WEBP': {'method': 6},
+    },
+}
+DEFAULT_ENCODE_SPEED = 'default'
+
+# Lossy formats whose quality max_bytes can search over
+QUALITY_SEARCH_FORMATS = ('JPEG', 'JPG', 'WEBP')
+
+# How passthrough places sources that already fit at the output path
+PASSTHROUGH_MODES = ('copy', 'link')
+
+# Rough single-core milliseconds per source megapixel, used to schedule
+# the most expensive images first (see plan_images)
+DECODE_COST_PER_MP = {
+    'BMP': 1.0, 'TIFF': 2.0, 'JPEG': 6.0, 'GIF': 8.0, 'PNG': 30.0, 'WEBP': 55.0,
+}
+DEFAULT_DECODE_COST_PER_MP = 30.0
+RESIZE_COST_PER_MP = 12.0
+
+# Source pixels decoded at a time by streaming mode
+STREAM_BAND_PIXELS = 4 * 1024 * 1024
+# Output formats that keep every frame of an animated source
+ANIMATED_FORMATS = ('GIF', 'WEBP')
+# Per-frame save options of an animation (not hashable, left out of the
+# quality hint classes)
+ANIMATION_OPTIONS = ('append_images', 'duration', 'disposal')
+
+# Raw bytes read per decoder call while filling a band
+STREAM_READ_BYTES = 1024 * 1024
+
+# Filter radius in source pixels at 1:1 scale, used to size band overlaps
+FILTER_SUPPORT = {
+    Image.Resampling.NEAREST: 0.5,
+    Image.Resampling.BOX: 0.5,
+    Image.Resampling.BILINEAR: 1.0,
+    Image.Resampling.HAMMING: 1.0,
+    Image.Resampling.BICUBIC: 2.0,
+    Image.Resampling.LANCZOS: 3.0,
+}
+
+# Created on first use by the async API
+_async_executor = None
+
+# Quality last chosen by a max_bytes search, per image class (see
+# _encode_within)
+_quality_hints = {}
+
+
+class ResizeResult(namedtuple('ResizeResult', [
+        'input_path', 'output_path', 'status', 'original_size', 'new_size',
+        'bytes_in', 'bytes_out', 'stages', 'error', 'fingerprint'],
+        defaults=(None, None, 0, 0, None, None, None))):
+    """
+    Outcome of resizing one image in a batch.
+    
+    A tuple subclass without a per-instance __dict__, so large batches can
+    keep or stream results cheaply and they pickle compactly across worker
+    processes.
+    
+    Attributes:
+        input_path (str): Path to the input image
+        output_path: Output path, or a list of paths for renditions
+        status (str): 'resized', 'copied' (passed through unchanged),
+            'cached', 'skipped' or 'failed'
+        original_size (tuple): (width, height) of the source, if it was read
+        new_size: (width, height) of the output, or a list for renditions
+        bytes_in (int): Size of the source file
+        bytes_out (int): Total size of the written outputs
+        stages (dict): Wall/CPU seconds per stage (see resize_image)
+        error (str): Error message if the image failed
+        fingerprint (tuple): (size, mtime_ns, sha256) of the source as the
+            worker read it, when incremental mode or the cache needed it
+    """
+    __slots__ = ()
+    
+    @property
+    def ok(self):
+        """bool: True unless the image failed."""
+        return self.status != 'failed'
+
+
+class PlannedImage(namedtuple('PlannedImage', ['path', 'format', 'size', 'cost'])):
+    """
+    Header information and estimated cost of one image, from plan_images.
+    
+    Attributes:
+        path (str): Path to the image
+        format (str): Format reported by the file header (e.g. 'JPEG')
+        size (tuple): (width, height) in pixels
+        cost (float): Estimated single-core decode and resize time in ms
+    """
+    __slots__ = ()
+
+
+def iter_images_from_folder(folder_path, extensions=None, recursive=False,
+                            exclude=None):
+    """
+    Lazily yield image files from the specified folder.
+    
+    Uses os.scandir so file types come from the directory entries without
+    an extra stat per file, and yields each path as soon as it is found.
+    
+    Args:
+        folder_path (str): Path to the folder containing images
+        extensions (list): List of image extensions to include (default: common formats)
+        recursive (bool): Also descend into subfolders
+        exclude (list): Folders to skip while recursing (e.g. the output folder)
+    
+    Yields:
+        str: Image file path
+    """
+    if extensions is None:
+        extensions = IMAGE_EXTENSIONS
+    
+    excluded = {os.path.realpath(path) for path in exclude or [] if path}
+    pending = [folder_path]
+    
+    while pending:
+        current = pending.pop()
+        try:
+            with os.scandir(current) as entries:
+                subfolders = []
+                for entry in entries:
+                    if entry.is_file():
+                        _, ext = os.path.splitext(entry.name)
+                        if ext.lower() in extensions:
+                            yield entry.path
+                    elif (recursive and entry.is_dir(follow_symlinks=False)
+                          and os.path.realpath(entry.path) not in excluded):
+                        subfolders.append(entry.path)
+        except OSError as e:
+            print(f"Warning: Cannot read folder '{current}': {str(e)}")
+            continue
+        # Walk subfolders in name order (pending is used as a stack)
+        pending.extend(sorted(subfolders, reverse=True))
+
+
+def get_images_from_folder(folder_path, extensions=None, recursive=False):
+    """
+    Get all image files from the specified folder.
+    
+    Args:
+        folder_path (str): Path to the folder containing images
+        extensions (list): List of image extensions to include (default: common formats)
+        recursive (bool): Also include images in subfolders
+    
+    Returns:
+        list: List of image file paths
+    """
+    if not os.path.exists(folder_path):
+        print(f"Error: Folder '{folder_path}' does not exist.")
+        return []
+    
+    return list(iter_images_from_folder(folder_path, extensions, recursive))
+
+
+def plan_images(image_paths):
+    """
+    Read only the header of each image and order them most expensive first.
+    
+    Image.open parses the header without decoding pixel data, so this
+    is cheap even for large files. Scheduling the costliest images first
+    keeps a few large files from running alone at the end of a parallel
+    batch.
+    
+    Args:
+        image_paths (iterable): Image paths
+    
+    Returns:
+        tuple: (planned, rejected) where planned is a list of PlannedImage
+            sorted by descending cost and rejected is a list of
+            (path, error message) for files that could not be identified
+    """
+    planned = []
+    rejected = []
+    for path in image_paths:
+        try:
+            with Image.open(path) as img:
+                image_format, size = img.format, img.size
+        except Exception as e:
+            rejected.append((path, str(e)))
+            continue
+        megapixels = size[0] * size[1] / 1e6
+        decode_cost = DECODE_COST_PER_MP.get(image_format, DEFAULT_DECODE_COST_PER_MP)
+        planned.append(PlannedImage(path, image_format, size,
+                                    megapixels * (decode_cost + RESIZE_COST_PER_MP)))
+    
+    planned.sort(key=lambda image: image.cost, reverse=True)
+    return planned, rejected
+
+
+def _calculate_dimensions(original_size, width=None, height=None,
+                          maintain_aspect=True):
+    """
+    Calculate the output dimensions for an image.
+    
+    Args:
+        original_size (tuple): (width, height) of the source image
+        width (int): Target width in pixels
+        height (int): Target height in pixels
+        maintain_aspect (bool): Whether to maintain aspect ratio
+    
+    Returns:
+        tuple: (new_width, new_height), or None if no dimensions were given
+    """
+    original_width, original_height = original_size
+    
+    if width and height:
+        if maintain_aspect:
+            # Calculate aspect ratio
+            aspect_ratio = original_width / original_height
+            
+            # Determine which dimension to use
+            if width / height > aspect_ratio:
+                # Height is the limiting factor
+                new_height = height
+                new_width = int(height * aspect_ratio)
+            else:
+                # Width is the limiting factor
+                new_width = width
+                new_height = int(width / aspect_ratio)
+        else:
+            new_width = width
+            new_height = height
+    elif width:
+        # Only width specified
+        aspect_ratio = original_height / original_width
+        new_width = width
+        new_height = int(width * aspect_ratio)
+    elif height:
+        # Only height specified
+        aspect_ratio = original_width / original_height
+        new_height = height
+        new_width = int(height * aspect_ratio)
+    else:
+        return None
+    
+    return new_width, new_height
+
+
+def _resample_filter(resample):
+    """
+    Look up a resampling filter.
+    
+    Args:
+        resample: Filter name from RESAMPLE_FILTERS (e.g. 'bilinear') or a
+            PIL.Image.Resampling value
+    
+    Returns:
+        PIL.Image.Resampling: The filter
+    
+    Raises:
+        ValueError: If the filter is unknown
+    """
+    if isinstance(resample, str):
+        try:
+            return RESAMPLE_FILTERS[resample.lower()]
+        except KeyError:
+            raise ValueError(f"Unknown resampling filter '{resample}' (choose from "
+                             f"{', '.join(RESAMPLE_FILTERS)})") from None
+    return Image.Resampling(resample)
+
+
+def _encoder_options(output_format, encode_speed=DEFAULT_ENCODE_SPEED):
+    """
+    Look up the encoder options for an output format.
+    
+    Args:
+        output_format (str): Output format (e.g., 'JPEG', 'PNG')
+        encode_speed (str): Profile name from ENCODE_PROFILES
+    
+    Returns:
+        dict: Keyword arguments for Image.save
+    
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    try:
+        profile = ENCODE_PROFILES[encode_speed]
+    except KeyError:
+        raise ValueError(f"Unknown encode speed '{encode_speed}' (choose from "
+                         f"{', '.join(ENCODE_PROFILES)})") from None
+    output_format = output_format.upper()
+    return profile.get('JPEG' if output_format == 'JPG' else output_format, {})
+
+
+@contextlib.contextmanager
+def _stage(metrics, name):
+    """
+    Accumulate the wall and CPU time of a processing stage into metrics.
+    
+    Args:
+        metrics (dict): Metrics to update (None = timing disabled)
+        name (str): Stage name (e.g. 'open', 'decode', 'resize')
+    """
+    if metrics is None:
+        yield
+        return
+    
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    try:
+        yield
+    finally:
+        stage = metrics.setdefault("stages", {}).setdefault(
+            name, {"wall": 0.0, "cpu": 0.0})
+        stage["wall"] += time.perf_counter() - wall_start
+        stage["cpu"] += time.thread_time() - cpu_start
+
+
+def _add_bytes(metrics, key, target, start=0):
+    """
+    Add the size of a file or the bytes written to a stream to metrics.
+    
+    Args:
+        metrics (dict): Metrics to update (None = disabled)
+        key (str): 'bytes_in' or 'bytes_out'
+        target: File path or binary file object
+        start (int): Stream position before writing
+    """
+    if metrics is None:
+        return
+    if isinstance(target, (str, os.PathLike)):
+        size = os.path.getsize(target)
+    elif target.seekable():
+        size = target.tell() - start
+    else:
+        return
+    metrics[key] = metrics.get(key, 0) + size
+
+
+@contextlib.contextmanager
+def _writing_output(output_path, metrics=None):
+    """
+    Prepare an output for encoding and count the bytes written to it.
+    
+    Outputs may be hardlinks into the cache (or to the source, with
+    passthrough='link'); such a file is unlinked so that writing replaces
+    this output instead of truncating the shared file. Shared by every
+    encoder path so that protection covers all of them.
+    
+    Args:
+        output_path: Path or writable binary file object
+        metrics (dict): Collects bytes_out once the block succeeds
+    
+    Yields:
+        callable: Writes already-encoded bytes (e.g. from _encode_within)
+            to output_path; encoders may also save to output_path directly
+    """
+    is_path = isinstance(output_path, (str, os.PathLike))
+    if is_path and os.path.exists(output_path) and os.stat(output_path).st_nlink > 1:
+        os.remove(output_path)
+    start = 0 if is_path or not output_path.seekable() else output_path.tell()
+    
+    def write(data):
+        if is_path:
+            with open(output_path, 'wb') as f:
+                f.write(data)
+        else:
+            output_path.write(data)
+    
+    yield write
+    _add_bytes(metrics, "bytes_out", output_path, start)
+
+
+def _flatten_alpha(img, background=DEFAULT_BACKGROUND):
+    """
+    Composite an image with transparency onto a solid background.
+    
+    The image is pasted using itself as the mask, so Pillow reads the
+    alpha band in place during a single compositing pass; only the RGB
+    result is allocated (plus an RGBA copy for palette images that carry
+    transparency).
+    
+    Args:
+        img (PIL.Image.Image): Image in RGBA, LA, PA or P mode
+        background (tuple): RGB background color
+    
+    Returns:
+        PIL.Image.Image: RGB image
+    """
+    if img.mode == 'P' and 'transparency' not in img.info:
+        # Opaque palette image; nothing to composite
+        return img.convert('RGB')
+    if img.mode in ('P', 'PA'):
+        img = img.convert('RGBA')
+    
+    flattened = Image.new('RGB', img.size, background)
+    flattened.paste(img, mask=img)
+    return flattened
+
+
+def _drop_alpha(img, background=DEFAULT_BACKGROUND):
+    """
+    Remove transparency from a decoded image before it is resampled.
+    
+    A fully opaque alpha band is simply discarded; otherwise the image is
+    composited onto the background. Compositing before the resize gives
+    the same result as resampling the (premultiplied) RGBA image and
+    flattening afterwards, but the filter then runs over three channels
+    instead of four and without premultiplication.
+    
+    Args:
+        img (PIL.Image.Image): Image in one of ALPHA_MODES
+        background (tuple): RGB background color
+    
+    Returns:
+        PIL.Image.Image: L or RGB image
+    """
+    if img.mode in ('RGBA', 'LA', 'PA') and img.getchannel('A').getextrema() == (255, 255):
+        return img.convert('L' if img.mode == 'LA' else 'RGB')
+    return _flatten_alpha(img, background)
+
+
+def _encode_within(img, output_format, max_quality, max_bytes, options):
+    """
+    Encode at the highest quality whose output fits in max_bytes.
+    
+    The first image of a class (format, budget, encoder options, mode and
+    pixel count rounded to a power of two) tries max_quality and then
+    bisects. Later images of the class start from the quality chosen last
+    time and step away from it in doubling strides until the answer is
+    bracketed, so similar images usually settle in about half the
+    encodes.
+    
+    Args:
+        img (PIL.Image.Image): Image to encode
+        output_format (str): 'JPEG' or 'WEBP'
+        max_quality (int): Highest quality to consider (1-100)
+        max_bytes (int): Size budget of the encoded image
+        options (dict): Further keyword arguments for Image.save (with
+            save_all and append_images for an animation)
+    
+    Returns:
+        bytes: The encoded image
+    
+    Raises:
+        ValueError: If the image exceeds max_bytes even at quality 1
+    """
+    # Animations are classed by their frame count rather than their frames
+    frames = options.get('append_images', ())
+    key = (output_format.upper(), max_bytes, max_quality,
+           tuple(sorted((name, value) for name, value in options.items()
+                        if name not in ANIMATION_OPTIONS)),
+           img.mode, (img.width * img.height).bit_length(), len(frames))
+    
+    def encode(quality):
+        buffer = io.BytesIO()
+        img.save(buffer, format=output_format, quality=quality, **options)
+        return buffer.getvalue()
+    
+    low, high = 1, max_quality
+    hint = _quality_hints.get(key)
+    probe = max_quality if hint is None else min(max(hint, low), high)
+    step = 1
+    best = None
+    smallest = None
+    bracketed = hint is None
+    
+    while low <= high:
+        data = encode(probe)
+        fits = len(data) <= max_bytes
+        if fits:
+            best = (probe, data)
+            low = probe + 1
+        else:
+            smallest = (probe, data)
+            high = probe - 1
+        if low > high:
+            break
+        # Bisect once both a fitting and an oversized quality are known
+        # (or straight away without a hint)
+        bracketed = bracketed or (best is not None and smallest is not None)
+        if bracketed:
+            probe = (low + high) // 2
+        else:
+            probe = min(max(probe + step if fits else probe - step, low), high)
+            step *= 2
+    
+    if best is None:
+        raise ValueError(f"Cannot encode under {max_bytes} bytes "
+                         f"({len(smallest[1])} bytes at quality {smallest[0]})")
+    
+    _quality_hints[key] = best[0]
+    return best[1]
+
+
+def _save_image(img, output_path, output_format, quality=95, metrics=None,
+                background=DEFAULT_BACKGROUND, encode_speed=DEFAULT_ENCODE_SPEED,
+                max_bytes=None):
+    """
+    Encode and save an image, flattening transparency for JPEG output.
+    
+    Args:
+        img (PIL.Image.Image): Image to save
+        output_path: Path or writable binary file object to save the image to
+        output_format (str): Output format (e.g., 'JPEG', 'PNG')
+        quality (int): Image quality (1-100) for JPEG
+        metrics (dict): Collects 'flatten'/'encode' stage times and bytes_out
+        background (tuple): RGB color transparent areas are flattened onto
+        encode_speed (str): Encoder profile from ENCODE_PROFILES
+        max_bytes (int): For JPEG/WebP, lower the quality (never above
+            quality) until the output fits in this many bytes
+    
+    Raises:
+        ValueError: If the image cannot be encoded within max_bytes
+    """
+    options = _encoder_options(output_format, encode_speed)
+    
+    if output_format.upper() in NO_ALPHA_FORMATS:
+        # Convert to RGB if necessary (JPEG doesn't support transparency)
+        if img.mode in ALPHA_MODES:
+            with _stage(metrics, "flatten"):
+                img = _flatten_alpha(img, background)
+    
+    with _writing_output(output_path, metrics) as write:
+        if max_bytes and output_format.upper() in QUALITY_SEARCH_FORMATS:
+            with _stage(metrics, "encode"):
+                write(_encode_within(img, output_format, quality, max_bytes, options))
+        elif output_format.upper() in NO_ALPHA_FORMATS:
+            with _stage(metrics, "encode"):
+                img.save(output_path, format=output_format, quality=quality, **options)
+        else:
+            with _stage(metrics, "encode"):
+                img.save(output_path, format=output_format, **options)
+
+
+def _resize_animation(img, sizes, resample, reducing_gap=None, frame_workers=1,
+                      metrics=None):
+    """
+    Decode every frame of an animated image and resize it as it arrives.
+    
+    Frames are fully composited (as Pillow renders them), so each can be
+    resampled on its own. Each distinct frame is resized to every size as
+    soon as it is decoded and only the resized copies are kept, so memory
+    grows with the output rather than the source. Consecutive identical
+    frames are merged into one shown for their combined duration, and a
+    frame identical to any earlier one reuses that frame's resized copies.
+    
+    Args:
+        img (PIL.Image.Image): Opened animated GIF or WebP
+        sizes (list): Output (width, height) of each rendition
+        resample (PIL.Image.Resampling): Resampling filter
+        reducing_gap (float): Integer box-reduction gap (see resize_image)
+        frame_workers (int): Threads resampling distinct frames in parallel;
+            Pillow releases the GIL while resampling
+        metrics (dict): Collects 'decode' and 'resize' stage times
+    
+    Returns:
+        tuple: (renditions, durations, disposal, info) where renditions holds
+            one list of RGB or RGBA frames per size, durations are
+            milliseconds, disposal is a list of GIF disposal methods (None
+            for WebP) and info holds the 'loop' and 'background' settings
+            to save with
+    """
+    def resize(frame):
+        return [frame.resize(size, resample, reducing_gap=reducing_gap)
+                for size in sizes]
+    
+    resized, order, durations, disposal = {}, [], [], []
+    has_alpha = False
+    with contextlib.ExitStack() as stack:
+        executor = None
+        if frame_workers > 1:
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=frame_workers))
+        pending = deque()
+        
+        for frame in ImageSequence.Iterator(img):
+            with _stage(metrics, "decode"):
+                # WebP sets a frame's duration only once it is loaded
+                frame.load()
+                duration = frame.info.get('duration', 0)
+                # Opaque frames stay RGB; they are converted at the end
+                # only if a later frame turns out to be transparent
+                if frame.mode in ALPHA_MODES or 'transparency' in frame.info:
+                    has_alpha = True
+                    frame = frame.convert('RGBA')
+                else:
+                    frame = frame.convert('RGB')
+                digest = hashlib.blake2b(frame.mode.encode() + frame.tobytes(),
+                                         digest_size=16).digest()
+            if order and digest == order[-1]:
+                durations[-1] += duration
+                continue
+            order.append(digest)
+            durations.append(duration)
+            disposal.append(getattr(img, 'disposal_method', None))
+            if digest in resized:
+                continue
+            
+            if executor is None:
+                with _stage(metrics, "resize"):
+                    resized[digest] = resize(frame)
+                continue
+            # Bound the full-size frames waiting for a thread
+            if len(pending) >= 2 * frame_workers:
+                with _stage(metrics, "resize"):
+                    pending.popleft().result()
+            resized[digest] = executor.submit(resize, frame)
+            pending.append(resized[digest])
+        
+        if executor is not None:
+            with _stage(metrics, "resize"):
+                resized = {digest: future.result()
+                           for digest, future in resized.items()}
+    
+    if has_alpha:
+        resized = {digest: [frame if frame.mode == 'RGBA' else frame.convert('RGBA')
+                            for frame in frames]
+                   for digest, frames in resized.items()}
+    renditions = [[resized[digest][index] for digest in order]
+                  for index in range(len(sizes))]
+    if any(method is None for method in disposal):
+        disposal = None
+    info = {key: img.info[key] for key in ('loop', 'background')
+            if key in img.info and not (key == 'background' and img.format == 'GIF')}
+    return renditions, durations, disposal, info
+
+
+def _save_animation(frames, output_path, output_format, durations, disposal,
+                    info, quality=95, metrics=None,
+                    encode_speed=DEFAULT_ENCODE_SPEED, max_bytes=None):
+    """
+    Encode and save the frames of an animation as GIF or WebP.
+    
+    Args:
+        frames (list): Resized frames
+        output_path: Path or writable binary file object to save to
+        output_format (str): 'GIF' or 'WEBP'
+        durations (list): Display time of each frame in milliseconds
+        disposal (list): GIF disposal method of each frame, or None
+        info (dict): 'loop' and 'background' settings from _resize_animation
+        quality (int): Image quality (1-100) for WebP
+        metrics (dict): Collects 'encode' stage times and bytes_out
+        encode_speed (str): Encoder profile from ENCODE_PROFILES
+        max_bytes (int): For WebP, lower the quality (never above quality)
+            until the whole animation fits in this many bytes
+    
+    Raises:
+        ValueError: If the animation cannot be encoded within max_bytes
+    """
+    options = dict(_encoder_options(output_format, encode_speed), **info,
+                   save_all=True, append_images=frames[1:], duration=durations)
+    if disposal is not None and output_format.upper() == 'GIF':
+        options['disposal'] = disposal
+    search = bool(max_bytes) and output_format.upper() in QUALITY_SEARCH_FORMATS
+    if output_format.upper() == 'WEBP' and not search:
+        options['quality'] = quality
+    
+    with _writing_output(output_path, metrics) as write:
+        with _stage(metrics, "encode"):
+            if search:
+                write(_encode_within(frames[0], output_format, quality,
+                                     max_bytes, options))
+            else:
+                frames[0].save(output_path, format=output_format, **options)
+
+
+def _same_format(source_format, output_format):
+    """Return True if an image in source_format can be kept as output_format."""
+    aliases = {'JPG': 'JPEG'}
+    source_format = (source_format or '').upper()
+    output_format = output_format.upper()
+    return aliases.get(source_format, source_format) == aliases.get(output_format, output_format)
+
+
+def _encoded_size(source):
+    """Return the size in bytes of a source path or seekable file object."""
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    position = source.tell()
+    size = source.seek(0, os.SEEK_END)
+    source.seek(position)
+    return size
+
+
+def _copy_source(source, output, passthrough='copy', metrics=None):
+    """
+    Write the encoded source unchanged to output.
+    
+    Args:
+        source: Path or seekable binary file object of the input image
+        output: Path or writable binary file object
+        passthrough (str): 'link' hardlinks path outputs to the source
+            (falling back to a copy); 'copy' always copies
+        metrics (dict): Collects bytes_out
+    """
+    if isinstance(output, (str, os.PathLike)):
+        if isinstance(source, (str, os.PathLike)):
+            if passthrough == 'link':
+                _link_or_copy(source, output)
+            else:
+                # Replace rather than truncate, in case output is a
+                # hardlink into the cache
+                temp_path = f"{output}.{os.getpid()}.tmp"
+                shutil.copyfile(source, temp_path)
+                os.replace(temp_path, output)
+        else:
+            source.seek(0)
+            with open(output, 'wb') as f:
+                shutil.copyfileobj(source, f)
+        _add_bytes(metrics, "bytes_out", output)
+        return
+    
+    start = output.tell() if output.seekable() else 0
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            shutil.copyfileobj(f, output)
+    else:
+        source.seek(0)
+        shutil.copyfileobj(source, output)
+    _add_bytes(metrics, "bytes_out", output, start)
+
+
+def _band_layout(img):
+    """
+    Work out how horizontal bands of an unloaded image can be decoded alone.
+    
+    Only uncompressed ('raw') data qualifies: images stored in several
+    strips or tiles (TIFF) can be cut at strip boundaries, and a single raw
+    block (BMP, single-strip TIFF) at any row. Compressed formats need the
+    whole frame in one decoder pass.
+    
+    Args:
+        img (PIL.Image.Image): Opened, not yet loaded image
+    
+    Returns:
+        tuple: (boundaries, tiles_for) where boundaries is a sorted list of
+            rows bands may start or end at (None = any row) and
+            tiles_for(top, bottom) returns (tile, byte_count) pairs for the
+            raw data of rows [top, bottom), with extents relative to top;
+            or None if the image cannot be streamed
+    """
+    if (img.mode in ('P', '1') or not img.tile
+            or any(tile.codec_name != 'raw' for tile in img.tile)):
+        return None
+    width, height = img.size
+    tags = getattr(img, 'tag_v2', {})
+    
+    if len(img.tile) > 1:
+        byte_counts = (tags.get(TiffImagePlugin.STRIPBYTECOUNTS)
+                       or tags.get(TiffImagePlugin.TILEBYTECOUNTS))
+        extents = [tile.extents for tile in img.tile]
+        # Planar images repeat each extent once per band
+        if (not isinstance(byte_counts, tuple) or len(byte_counts) != len(img.tile)
+                or len(set(extents)) != len(extents)):
+            return None
+        boundaries = sorted({row for extent in extents for row in (extent[1], extent[3])})
+        
+        def tiles_for(top, bottom):
+            return [(tile._replace(extents=(tile.extents[0], tile.extents[1] - top,
+                                            tile.extents[2], tile.extents[3] - top)),
+                     byte_count)
+                    for tile, byte_count in zip(img.tile, byte_counts)
+                    if tile.extents[1] >= top and tile.extents[3] <= bottom]
+        
+        return boundaries, tiles_for
+    
+    tile = img.tile[0]
+    rawmode, stride, orientation = tile.args
+    if tile.extents != (0, 0, width, height):
+        return None
+    if not stride:
+        # Packed rows; an uncompressed single-strip TIFF records their size
+        byte_counts = tags.get(TiffImagePlugin.STRIPBYTECOUNTS)
+        if (not isinstance(byte_counts, tuple) or len(byte_counts) != 1
+                or byte_counts[0] % height):
+            return None
+        stride = byte_counts[0] // height
+    
+    def tiles_for(top, bottom):
+        # Bottom-up rasters (negative orientation) store the last row first
+        first_row = top if orientation > 0 else height - bottom
+        return [(tile._replace(extents=(0, 0, width, bottom - top),
+                               offset=tile.offset + first_row * stride,
+                               args=(rawmode, stride, orientation)),
+                 (bottom - top) * stride)]
+    
+    return None, tiles_for
+
+
+def _read_band(source_path, mode, width, tiles):
+    """
+    Decode one band of an image from its raw tiles.
+    
+    Args:
+        source_path (str): Path to the image
+        mode (str): Image mode
+        width (int): Image width
+        tiles (list): (tile, byte_count) pairs from a _band_layout
+            tiles_for call
+    
+    Returns:
+        PIL.Image.Image: The decoded band
+    """
+    height = max(tile.extents[3] for tile, _ in tiles)
+    band = Image.new(mode, (width, height))
+    with open(source_path, 'rb') as f:
+        for tile, byte_count in tiles:
+            # Decode straight into the band, a few rows at a time, so no
+            # band-sized buffer of raw bytes is ever held
+            decoder = Image._getdecoder(mode, 'raw', tile.args)
+            decoder.setimage(band.im, tile.extents)
+            f.seek(tile.offset)
+            pending = b""
+            while byte_count > 0:
+                chunk = f.read(min(byte_count, STREAM_READ_BYTES))
+                if not chunk:
+                    break
+                byte_count -= len(chunk)
+                consumed, _ = decoder.decode(pending + chunk)
+                if consumed < 0:
+                    break
+                pending = (pending + chunk)[consumed:]
+            decoder.cleanup()
+    return band
+
+
+def _map_raw(source_path, img):
+    """
+    Decode an uncompressed image from a memory map of its file.
+    
+    When the pixel data is a single block already laid out in the image's
+    own mode (8-bit grey, RGBA, RGBX, CMYK, 16-bit), the image wraps the
+    mapped pages directly and nothing is copied or decoded. Other raw
+    layouts (BGR bitmaps, multi-strip TIFFs) are unpacked straight from the
+    mapped pages into the image, skipping the intermediate read buffers.
+    Either way workers reading the same files share one copy in the OS
+    page cache.
+    
+    Args:
+        source_path (str): Path to the image
+        img (PIL.Image.Image): The same image, opened but not loaded
+    
+    Returns:
+        PIL.Image.Image: The decoded image (read-only when zero-copy), or
+            None if the image is not uncompressed (see _band_layout)
+    """
+    layout = _band_layout(img)
+    if layout is None:
+        return None
+    width, height = img.size
+    tiles = layout[1](0, height)
+    
+    try:
+        with open(source_path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if any(tile.offset + byte_count > len(mapped) for tile, byte_count in tiles):
+        mapped.close()
+        return None
+    
+    tile, byte_count = tiles[0]
+    if (len(tiles) == 1 and tile.args[0] == img.mode
+            and img.mode in Image._MAPMODES):
+        # The image keeps the map open for as long as it lives
+        return Image.frombuffer(img.mode, img.size,
+                                memoryview(mapped)[tile.offset:tile.offset + byte_count],
+                                'raw', *tile.args)
+    
+    decoded = Image.new(img.mode, img.size)
+    with memoryview(mapped) as view:
+        for tile, byte_count in tiles:
+            decoder = Image._getdecoder(img.mode, 'raw', tile.args)
+            decoder.setimage(decoded.im, tile.extents)
+            decoder.decode(view[tile.offset:tile.offset + byte_count])
+            decoder.cleanup()
+    mapped.close()
+    return decoded
+
+
+def _resize_streamed(source_path, img, dimensions, resample, reducing_gap=None):
+    """
+    Downscale an uncompressed image band by band.
+    
+    Each band of output rows is resampled from just the source rows it
+    needs, plus enough overlap for the filter, so the result matches a
+    full-frame resize to within rounding (nearest-neighbour near 1:1 scale
+    can pick the neighbouring source row) while memory stays at one
+    source band of about STREAM_BAND_PIXELS plus the output image.
+    
+    Args:
+        source_path (str): Path to the image
+        img (PIL.Image.Image): The same image, opened but not loaded
+        dimensions (tuple): Output (width, height), no larger than the source
+        resample (PIL.Image.Resampling): Resampling filter
+        reducing_gap (float): Integer box-reduction gap (see resize_image)
+    
+    Returns:
+        PIL.Image.Image: The resized image, or None if the source cannot be
+            read in bands (see _band_layout)
+    """
+    layout = _band_layout(img)
+    if layout is None:
+        return None
+    boundaries, tiles_for = layout
+    
+    source_width, source_height = img.size
+    output_width, output_height = dimensions
+    scale = source_height / output_height
+    margin = math.ceil(FILTER_SUPPORT[resample] * max(scale, 1.0)) + 1
+    rows_per_band = max(1, int(STREAM_BAND_PIXELS / source_width / scale))
+    
+    output = Image.new(img.mode, dimensions)
+    for output_top in range(0, output_height, rows_per_band):
+        output_bottom = min(output_top + rows_per_band, output_height)
+        box_top = output_top * scale
+        box_bottom = output_bottom * scale
+        
+        top = max(0, math.floor(box_top) - margin)
+        bottom = min(source_height, math.ceil(box_bottom) + margin)
+        if boundaries is not None:
+            top = max(row for row in boundaries if row <= top)
+            bottom = min(row for row in boundaries if row >= bottom)
+        
+        with _read_band(source_path, img.mode, source_width,
+                        tiles_for(top, bottom)) as band:
+            part = band.resize((output_width, output_bottom - output_top), resample,
+                               box=(0, box_top - top, source_width, box_bottom - top),
+                               reducing_gap=reducing_gap)
+        output.paste(part, (0, output_top))
+    return output
+
+
+def _resize_source(source, output, width=None, height=None,
+                   maintain_aspect=True, quality=95, output_format=None,
+                   draft=True, reducing_gap=None, metrics=None,
+                   background=DEFAULT_BACKGROUND, flatten_first=True,
+                   resample=DEFAULT_RESAMPLE, encode_speed=DEFAULT_ENCODE_SPEED,
+                   max_bytes=None, passthrough=None, stream=False,
+                   animated=True, frame_workers=1):
+    """
+    Decode, resize and encode one image.
+    
+    Args:
+        source: Path or readable binary file object of the input image
+        output: Path or writable binary file object for the resized image
+        metrics (dict): Collects per-stage timings and byte counts
+        (remaining arguments as for resize_image)
+    
+    Returns:
+        tuple: ((original_width, original_height), (new_width, new_height),
+            copied) where copied is True if the source was passed through
+    
+    Raises:
+        ValueError: If neither width nor height is given, the resampling
+            filter or encode speed is unknown, or the output does not fit
+            in max_bytes
+    """
+    resample = _resample_filter(resample)
+    
+    if isinstance(source, (str, os.PathLike)):
+        _add_bytes(metrics, "bytes_in", source)
+    
+    # Open the image
+    with _stage(metrics, "open"):
+        img = Image.open(source)
+    
+    with img:
+        original_size = img.size
+        
+        # Calculate new dimensions
+        dimensions = _calculate_dimensions(img.size, width, height,
+                                           maintain_aspect)
+        if dimensions is None:
+            raise ValueError("No dimensions specified")
+        
+        # Determine output format from the source before draft mode
+        # reconfigures the decoder
+        if output_format is None:
+            output_format = img.format or 'PNG'
+        
+        # Never enlarge in passthrough mode, on either axis; a source that
+        # already fits and needs no conversion is written out without decoding
+        if passthrough:
+            dimensions = (min(dimensions[0], original_size[0]),
+                          min(dimensions[1], original_size[1]))
+        if passthrough and dimensions == original_size:
+            if (_same_format(img.format, output_format)
+                    and (not max_bytes or _encoded_size(source) <= max_bytes)):
+                with _stage(metrics, "copy"):
+                    _copy_source(source, output, passthrough, metrics)
+                return original_size, dimensions, True
+        
+        # Keep every frame when both the source and the output can animate
+        if (animated and getattr(img, 'is_animated', False)
+                and output_format.upper() in ANIMATED_FORMATS):
+            (frames,), durations, disposal, info = _resize_animation(
+                img, [dimensions], resample, reducing_gap, frame_workers, metrics)
+            _save_animation(frames, output, output_format, durations, disposal,
+                            info, quality, metrics, encode_speed, max_bytes)
+            if metrics is not None:
+                metrics["frames"] = len(frames)
+            return original_size, dimensions, False
+        
+        # Downscale uncompressed sources band by band instead of holding
+        # the full-resolution bitmap
+        resized_img = None
+        if (stream and isinstance(source, (str, os.PathLike))
+                and dimensions[0] <= original_size[0]
+                and dimensions[1] <= original_size[1]):
+            with _stage(metrics, "stream"):
+                resized_img = _resize_streamed(source, img, dimensions, resample,
+                                               reducing_gap)
+        
+        if resized_img is None:
+            # Let libjpeg decode at the largest power-of-two reduction
+            # that is still at least the target size
+            with _stage(metrics, "decode"):
+                if draft and img.format == 'JPEG':
+                    img.draft(img.mode, dimensions)
+                if isinstance(source, (str, os.PathLike)):
+                    img = _map_raw(source, img) or img
+                img.load()
+            
+            # Resample three channels instead of four when alpha is
+            # discarded on save anyway
+            if (flatten_first and img.mode in ALPHA_MODES
+                    and output_format.upper() in NO_ALPHA_FORMATS):
+                with _stage(metrics, "flatten"):
+                    img = _drop_alpha(img, background)
+            
+            # Resize the image
+            with _stage(metrics, "resize"):
+                resized_img = img.resize(dimensions, resample,
+                                         reducing_gap=reducing_gap)
+        
+        # Save the image
+        _save_image(resized_img, output, output_format, quality, metrics,
+                    background, encode_speed, max_bytes)
+    
+    return original_size, dimensions, False
+
+
+def resize_image(input_path, output_path, width=None, height=None, 
+                 maintain_aspect=True, quality=95, output_format=None,
+                 draft=True, reducing_gap=None, metrics=None, quiet=False,
+                 background=DEFAULT_BACKGROUND, flatten_first=True,
+                 resample=DEFAULT_RESAMPLE, encode_speed=DEFAULT_ENCODE_SPEED,
+                 max_bytes=None, passthrough=None, stream=False, animated=True,
+                 frame_workers=1):
+    """
+    Resize a single image.
+    
+    Args:
+        input_path (str): Path to input image
+        output_path (str): Path to save resized image
+        width (int): Target width in pixels
+        height (int): Target height in pixels
+        maintain_aspect (bool): Whether to maintain aspect ratio
+        quality (int): Image quality (1-100) for JPEG
+        output_format (str): Output format (e.g., 'JPEG', 'PNG')
+        draft (bool): Let libjpeg downscale JPEG sources while decoding
+        reducing_gap (float): Box-reduce by an integer factor first, leaving
+            at least this multiple of the target size for the final filter
+            (e.g. 2.0 or 3.0; None = single full-quality pass)
+        metrics (dict): If given, filled with per-stage wall/CPU seconds
+            under 'stages' ('open', 'decode', 'resize', 'flatten', 'encode'),
+            'bytes_in', 'bytes_out', 'original_size', 'new_size' and 'error'
+        quiet (bool): Don't print a line for each successfully resized image
+        background (tuple): RGB color transparent areas are flattened onto
+            when saving to a format without alpha (default: white)
+        flatten_first (bool): For output formats without alpha, drop or
+            flatten transparency before resizing rather than after
+        resample: Resampling filter name from RESAMPLE_FILTERS or a
+            PIL.Image.Resampling value (default: 'lanczos')
+        encode_speed (str): Encoder profile: 'fast' (no extra Huffman pass,
+            zlib level 1, WebP method 0), 'default' or 'small' (progressive
+            JPEG, optimized PNG, WebP method 6)
+        max_bytes (int): For JPEG/WebP output, search for the highest
+            quality up to quality whose output fits in this many bytes;
+            the image fails if even quality 1 is too large
+        passthrough (str): Never upscale either side. Sources already within the
+            target size are copied byte for byte ('copy') or hardlinked
+            ('link') when no format conversion or max_bytes reduction is
+            needed, and otherwise re-encoded at their original size.
+            None (default) resizes every image.
+        stream (bool): Downscale uncompressed TIFF and BMP sources in
+            bands of rows, so memory stays near the output size instead of
+            the full-resolution bitmap; other sources are decoded whole
+        animated (bool): Resize every frame of animated GIF and WebP sources
+            saved as GIF or WebP, keeping frame durations, looping and GIF
+            disposal; identical frames are resampled once. False (or any
+            other output format) keeps only the first frame.
+        frame_workers (int): Threads resampling animation frames in parallel
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    if not width and not height:
+        print(f"Warning: No dimensions specified for {input_path}")
+        if metrics is not None:
+            metrics["error"] = "No dimensions specified"
+        return False
+    
+    try:
+        original_size, new_size, copied = _resize_source(
+            input_path, output_path, width, height, maintain_aspect, quality,
+            output_format, draft, reducing_gap, metrics, background,
+            flatten_first, resample, encode_speed, max_bytes, passthrough,
+            stream, animated, frame_workers)
+    except Exception as e:
+        print(f"✗ Error processing {input_path}: {str(e)}")
+        if metrics is not None:
+            metrics["error"] = str(e)
+        return False
+    
+    if metrics is not None:
+        metrics["original_size"] = original_size
+        metrics["new_size"] = new_size
+        metrics["copied"] = copied
+    if quiet:
+        pass
+    elif copied:
+        print(f"✓ Copied: {os.path.basename(input_path)} "
+              f"({original_size[0]}x{original_size[1]} already fits)")
+    else:
+        print(f"✓ Resized: {os.path.basename(input_path)} "
+              f"({original_size[0]}x{original_size[1]} → {new_size[0]}x{new_size[1]})")
+    return True
+
+
+def resize_image_bytes(data, width=None, height=None, maintain_aspect=True,
+                       quality=95, output_format=None, draft=True,
+                       reducing_gap=None, output=None, metrics=None,
+                       background=DEFAULT_BACKGROUND, flatten_first=True,
+                       resample=DEFAULT_RESAMPLE,
+                       encode_speed=DEFAULT_ENCODE_SPEED, max_bytes=None,
+                       passthrough=None, animated=True, frame_workers=1):
+    """
+    Resize an image held in memory, without touching the filesystem.
+    
+    Args:
+        data: Encoded input image as bytes, bytearray, memoryview or a
+            readable binary file object
+        width (int): Target width in pixels
+        height (int): Target height in pixels
+        maintain_aspect (bool): Whether to maintain aspect ratio
+        quality (int): Image quality (1-100) for JPEG
+        output_format (str): Output format (default: same as the input)
+        draft (bool): Let libjpeg downscale JPEG sources while decoding
+        reducing_gap (float): Integer box-reduction gap (see resize_image)
+        output: Writable binary file object to encode into instead of
+            returning bytes (e.g. a response stream or io.BytesIO)
+        metrics (dict): Collects per-stage timings and byte counts
+            (see resize_image)
+        background (tuple): RGB color transparent areas are flattened onto
+        flatten_first (bool): Remove transparency before resizing for
+            output formats without alpha
+        resample: Resampling filter (see resize_image)
+        encode_speed (str): Encoder profile (see resize_image)
+        max_bytes (int): Size budget for JPEG/WebP output (see resize_image)
+        passthrough (str): Never upscale; return the input bytes unchanged
+            when they already fit (see resize_image)
+        animated (bool): Keep every frame of animated GIF/WebP input
+            (see resize_image)
+        frame_workers (int): Threads resampling animation frames in parallel
+    
+    Returns:
+        bytes: Encoded image, or the number of bytes written if output is given
+    
+    Raises:
+        ValueError: If neither width nor height is given, the resampling
+            filter or encode speed is unknown, or the output does not fit
+            in max_bytes
+        PIL.UnidentifiedImageError: If the data is not a readable image
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        if metrics is not None:
+            metrics["bytes_in"] = memoryview(data).nbytes
+        data = io.BytesIO(data)
+    
+    buffer = io.BytesIO() if output is None else output
+    start = buffer.tell() if output is not None and buffer.seekable() else 0
+    
+    _resize_source(data, buffer, width, height, maintain_aspect, quality,
+                   output_format, draft, reducing_gap, metrics, background,
+                   flatten_first, resample, encode_speed, max_bytes,
+                   passthrough, animated=animated, frame_workers=frame_workers)
+    
+    if output is None:
+        return buffer.getvalue()
+    return buffer.tell() - start if buffer.seekable() else None
+
+
+def resize_image_renditions(input_path, renditions, maintain_aspect=True,
+                            quality=95, draft=True, reducing_gap=None,
+                            cascade=True, metrics=None, quiet=False,
+                            background=DEFAULT_BACKGROUND, flatten_first=True,
+                            resample=DEFAULT_RESAMPLE,
+                            encode_speed=DEFAULT_ENCODE_SPEED, max_bytes=None,
+                            passthrough=None, stream=False, animated=True,
+                            frame_workers=1):
+    """
+    Produce several resized renditions of an image from a single decode.
+    
+    Renditions are generated largest-first. When cascade is enabled each
+    smaller rendition is resampled from the previous (larger) result
+    instead of from the full-resolution source.
+    
+    Args:
+        input_path (str): Path to input image
+        renditions (list): List of dicts with keys 'output_path', 'width',
+            'height' and optionally 'output_format', 'quality' and
+            'max_bytes'
+        maintain_aspect (bool): Whether to maintain aspect ratio
+        quality (int): Default image quality (1-100) for JPEG
+        draft (bool): Let libjpeg downscale JPEG sources while decoding
+        reducing_gap (float): Integer box-reduction gap (see resize_image)
+        cascade (bool): Resample smaller renditions from larger ones
+        metrics (dict): Collects per-stage timings and byte counts, summed
+            over all renditions (see resize_image); 'new_size' is a list
+            with one entry per rendition (None where it failed)
+        quiet (bool): Don't print a line for each rendition written
+        background (tuple): RGB color transparent areas are flattened onto
+        flatten_first (bool): Remove transparency once, before resizing,
+            when no rendition's output format supports alpha
+        resample: Resampling filter (see resize_image)
+        encode_speed (str): Encoder profile (see resize_image)
+        max_bytes (int): Default size budget for JPEG/WebP renditions
+            (see resize_image)
+        passthrough (str): Never upscale; renditions the source already
+            fits are copied or linked from it (see resize_image)
+        stream (bool): For uncompressed sources, stream the largest
+            rendition in bands instead of decoding the source whole (see
+            resize_image) and derive the others from it; only when every
+            rendition is an aspect-preserving downscale
+        animated (bool): Keep every frame of animated sources in GIF and
+            WebP renditions (see resize_image)
+        frame_workers (int): Threads resampling animation frames in parallel
+    
+    Returns:
+        list: One bool per rendition, True if it was saved successfully
+    """
+    results = [False] * len(renditions)
+    new_sizes = [None] * len(renditions)
+    if metrics is not None:
+        metrics["new_size"] = new_sizes
+    
+    try:
+        resample = _resample_filter(resample)
+        _add_bytes(metrics, "bytes_in", input_path)
+        with _stage(metrics, "open"):
+            img = Image.open(input_path)
+        
+        with img:
+            original_width, original_height = img.size
+            source_format = img.format or 'PNG'
+            if metrics is not None:
+                metrics["original_size"] = img.size
+            
+            # Calculate dimensions for every rendition up front
+            targets = []
+            for index, rendition in enumerate(renditions):
+                dimensions = _calculate_dimensions(
+                    img.size, rendition.get('width'), rendition.get('height'),
+                    maintain_aspect)
+                if dimensions is None:
+                    print(f"Warning: No dimensions specified for rendition "
+                          f"{rendition.get('output_path')}")
+                    if metrics is not None:
+                        metrics.setdefault("error", "No dimensions specified")
+                    continue
+                # Forced (distorting) sizes must not feed other renditions
+                keeps_aspect = maintain_aspect or not (
+                    rendition.get('width') and rendition.get('height'))
+                
+                if passthrough:
+                    clamped = (min(dimensions[0], original_width),
+                               min(dimensions[1], original_height))
+                    if clamped != dimensions:
+                        # Clamping one side of a forced size changes its shape
+                        keeps_aspect = clamped == img.size
+                        dimensions = clamped
+                if passthrough and dimensions == img.size:
+                    rendition_max_bytes = rendition.get('max_bytes', max_bytes)
+                    if (_same_format(source_format,
+                                     rendition.get('output_format') or source_format)
+                            and (not rendition_max_bytes
+                                 or _encoded_size(input_path) <= rendition_max_bytes)):
+                        try:
+                            with _stage(metrics, "copy"):
+                                _copy_source(input_path, rendition['output_path'],
+                                             passthrough, metrics)
+                        except OSError as e:
+                            print(f"✗ Error processing {input_path} → "
+                                  f"{rendition['output_path']}: {str(e)}")
+                            if metrics is not None:
+                                metrics.setdefault("error", str(e))
+                            continue
+                        results[index] = True
+                        new_sizes[index] = img.size
+                        if not quiet:
+                            print(f"✓ Copied: {os.path.basename(input_path)} "
+                                  f"({original_width}x{original_height} already fits) "
+                                  f"→ {rendition['output_path']}")
+                        continue
+                    keeps_aspect = True
+                
+                targets.append((index, dimensions, keeps_aspect))
+            
+            if not targets:
+                return results
+            
+            # Renditions in a format that can animate keep every frame;
+            # each frame is decoded once and resized to all of them
+            animated_targets = []
+            if animated and getattr(img, 'is_animated', False):
+                animated_targets = [
+                    target for target in targets
+                    if (renditions[target[0]].get('output_format')
+                        or source_format).upper() in ANIMATED_FORMATS]
+            if animated_targets:
+                resized_frames, durations, disposal, info = _resize_animation(
+                    img, [dimensions for _, dimensions, _ in animated_targets],
+                    resample, reducing_gap, frame_workers, metrics)
+                img.seek(0)
+                for position, (index, (new_width, new_height), _) in enumerate(animated_targets):
+                    rendition = renditions[index]
+                    output_path = rendition['output_path']
+                    # Release each rendition's frames once it is saved
+                    frames, resized_frames[position] = resized_frames[position], None
+                    try:
+                        _save_animation(frames, output_path,
+                                        rendition.get('output_format') or source_format,
+                                        durations, disposal, info,
+                                        rendition.get('quality', quality), metrics,
+                                        encode_speed,
+                                        rendition.get('max_bytes', max_bytes))
+                    except Exception as e:
+                        print(f"✗ Error processing {input_path} → {output_path}: {str(e)}")
+                        if metrics is not None:
+                            metrics.setdefault("error", str(e))
+                        continue
+                    results[index] = True
+                    new_sizes[index] = (new_width, new_height)
+                    if not quiet:
+                        print(f"✓ Resized: {os.path.basename(input_path)} "
+                              f"({original_width}x{original_height} → {new_width}x{new_height}, "
+                              f"{len(frames)} frames) → {output_path}")
+                del frames
+                targets = [target for target in targets
+                           if target not in animated_targets]
+                if not targets:
+                    return results
+            
+            largest = max((d for _, d, _ in targets), key=lambda d: d[0] * d[1])
+            source_img = None
+            if stream and all(keeps_aspect and d[0] <= original_width
+                              and d[1] <= original_height
+                              for _, d, keeps_aspect in targets):
+                with _stage(metrics, "stream"):
+                    source_img = _resize_streamed(input_path, img, largest,
+                                                  resample, reducing_gap)
+            
+            if source_img is None:
+                # Decode once, at a scale that still covers the largest
+                # rendition
+                with _stage(metrics, "decode"):
+                    if draft and img.format == 'JPEG':
+                        img.draft(img.mode, (max(d[0] for _, d, _ in targets),
+                                             max(d[1] for _, d, _ in targets)))
+                    # Later renditions still read the source, so it must
+                    # not be mapped if one of them overwrites it
+                    source_img = img
+                    if not any(os.path.abspath(renditions[index]['output_path'])
+                               == os.path.abspath(input_path)
+                               for index, _, _ in targets):
+                        source_img = _map_raw(input_path, img) or img
+                    source_img.load()
+            
+            if (flatten_first and source_img.mode in ALPHA_MODES and all(
+                (renditions[index].get('output_format') or source_format).upper()
+                in NO_ALPHA_FORMATS for index, _, _ in targets)):
+                with _stage(metrics, "flatten"):
+                    source_img = _drop_alpha(source_img, background)
+            
+            targets.sort(key=lambda t: t[1][0] * t[1][1], reverse=True)
+            previous = None
+            
+            for index, (new_width, new_height), keeps_aspect in targets:
+                rendition = renditions[index]
+                output_path = rendition['output_path']
+                
+                source = source_img
+                if (cascade and keeps_aspect and previous is not None
+                        and previous.width >= new_width
+                        and previous.height >= new_height):
+                    source = previous
+                
+                try:
+                    with _stage(metrics, "resize"):
+                        resized_img = source.resize((new_width, new_height),
+                                                    resample,
+                                                    reducing_gap=reducing_gap)
+                    _save_image(resized_img, output_path,
+                                rendition.get('output_format') or source_format,
+                                rendition.get('quality', quality), metrics,
+                                background, encode_speed,
+                                rendition.get('max_bytes', max_bytes))
+                except Exception as e:
+                    print(f"✗ Error processing {input_path} → {output_path}: {str(e)}")
+                    if metrics is not None:
+                        metrics.setdefault("error", str(e))
+                    continue
+                
+                # Only downscaled renditions are reused; an upscaled one
+                # would feed interpolated pixels into the next pass
+                if (keeps_aspect and new_width <= img.width
+                        and new_height <= img.height):
+                    previous = resized_img
+                results[index] = True
+                new_sizes[index] = (new_width, new_height)
+                if not quiet:
+                    print(f"✓ Resized: {os.path.basename(input_path)} "
+                          f"({original_width}x{original_height} → {new_width}x{new_height}) "
+                          f"→ {output_path}")
+    
+    except Exception as e:
+        print(f"✗ Error processing {input_path}: {str(e)}")
+        if metrics is not None:
+            metrics["error"] = str(e)
+    
+    return results
+
+
+def _build_output_path(image_path, output_folder, output_format=None,
+                       prefix="", suffix="", input_folder=None):
+    """
+    Build the output path for an input image.
+    
+    Args:
+        image_path (str): Path to the input image
+        output_folder (str): Folder to save resized images
+        output_format (str): Output format (e.g., 'JPEG', 'PNG')
+        prefix (str): Prefix to add to output filename
+        suffix (str): Suffix to add to output filename
+        input_folder (str): When given, mirror the image's subfolder
+            relative to input_folder inside output_folder
+    
+    Returns:
+        str: Path of the output file
+    """
+    if input_folder:
+        relative_dir = os.path.relpath(os.path.dirname(image_path), input_folder)
+        if relative_dir != os.curdir:
+            output_folder = os.path.join(output_folder, relative_dir)
+    
+    filename = os.path.basename(image_path)
+    name, ext = os.path.splitext(filename)
+    
+    # Determine output extension
+    if output_format:
+        if output_format.upper() in ['JPEG', 'JPG']:
+            output_ext = '.jpg'
+        else:
+            output_ext = f'.{output_format.lower()}'
+    else:
+        output_ext = ext
+    
+    # Create output filename with prefix/suffix
+    output_filename = f"{prefix}{name}{suffix}{output_ext}"
+    return os.path.join(output_folder, output_filename)
+
+
+def _size_label(width=None, height=None):
+    """
+    Build a folder name for a rendition size (e.g. '800', 'x600', '800x600').
+    
+    Args:
+        width (int): Target width in pixels
+        height (int): Target height in pixels
+    
+    Returns:
+        str: Label for the size
+    """
+    if width and height:
+        return f"{width}x{height}"
+    if width:
+        return str(width)
+    return f"x{height}"
+
+
+def _resize_chunk(tasks, resize_kwargs, cache_dir=None, quiet=False,
+                  frame_workers=1, fingerprint=False):
+    """
+    Resize a chunk of images. Runs in the calling process or in a pool worker.
+    
+    Args:
+        tasks (list): List of (input_path, output) tuples, where output is
+            an output path or a list of renditions for resize_image_renditions
+        resize_kwargs (dict): Keyword arguments passed to the resize function
+        cache_dir (str): Content-addressed output cache folder (None = disabled)
+        quiet (bool): Don't print a line for each successfully resized image
+        frame_workers (int): Threads resampling the frames of one animation
+        fingerprint (bool): Return each source's size, mtime and digest
+            with its result, for the incremental manifest
+    
+    Returns:
+        list: One ResizeResult per task
+    """
+    results = []
+    for input_path, output in tasks:
+        if cache_dir:
+            results.append(_resize_cached(input_path, output, resize_kwargs,
+                                          cache_dir, quiet, frame_workers))
+        else:
+            results.append(_resize_task(input_path, output, resize_kwargs, quiet,
+                                        frame_workers, fingerprint))
+    return results
+
+
+def _output_paths(output):
+    """
+    Return a task's output path, or the list of rendition output paths.
+    
+    Args:
+        output: Output path, or a list of rendition dicts
+    
+    Returns:
+        Output path or list of paths
+    """
+    if isinstance(output, list):
+        return _task_outputs(output)
+    return output
+
+
+def _make_result(input_path, output, ok, metrics, status='resized'):
+    """
+    Build a ResizeResult from the metrics collected while resizing.
+    
+    Args:
+        input_path (str): Path to input image
+        output: Output path, or a list of rendition dicts
+        ok (bool): Whether the image was processed successfully
+        metrics (dict): Metrics filled in by the resize function
+        status (str): Status to report when ok
+    
+    Returns:
+        ResizeResult: Result record
+    """
+    return ResizeResult(
+        input_path=input_path,
+        output_path=_output_paths(output),
+        status=status if ok else 'failed',
+        original_size=metrics.get("original_size"),
+        new_size=metrics.get("new_size"),
+        bytes_in=metrics.get("bytes_in", 0),
+        bytes_out=metrics.get("bytes_out", 0),
+        stages=metrics.get("stages"),
+        error=None if ok else metrics.get("error", "Unknown error"),
+        fingerprint=metrics.get("fingerprint"),
+    )
+
+
+def _resize_task(input_path, output, resize_kwargs, quiet=False, frame_workers=1,
+                 fingerprint=False):
+    """
+    Run the resize function matching a task's output.
+    
+    Args:
+        input_path (str): Path to input image
+        output: Output path, or a list of renditions for resize_image_renditions
+        resize_kwargs (dict): Keyword arguments passed to the resize function
+        quiet (bool): Don't print a line for each successfully resized image
+        frame_workers (int): Threads resampling the frames of one animation
+        fingerprint (bool): Stat and hash the source before resizing and
+            return them with the result (see _fingerprint)
+    
+    Returns:
+        ResizeResult: Result record
+    """
+    metrics = {}
+    if fingerprint:
+        try:
+            with _stage(metrics, "hash"):
+                metrics["fingerprint"] = _fingerprint(input_path)
+        except OSError as e:
+            print(f"✗ Error processing {input_path}: {str(e)}")
+            metrics["error"] = str(e)
+            return _make_result(input_path, output, False, metrics)
+    
+    if isinstance(output, list):
+        ok = all(resize_image_renditions(input_path, output, metrics=metrics,
+                                         quiet=quiet, frame_workers=frame_workers,
+                                         **resize_kwargs))
+    else:
+        ok = resize_image(input_path, output, metrics=metrics, quiet=quiet,
+                          frame_workers=frame_workers, **resize_kwargs)
+    return _make_result(input_path, output, ok, metrics,
+                        'copied' if metrics.get("copied") else 'resized')
+
+
+def _run_serial(tasks, resize_kwargs, cache_dir=None, quiet=False,
+                frame_workers=1, fingerprint=False):
+    """
+    Resize tasks one at a time in the calling process.
+    
+    Args:
+        tasks (iterable): (input_path, output) tuples
+        resize_kwargs (dict): Keyword arguments passed to the resize function
+        cache_dir (str): Content-addressed output cache folder (None = disabled)
+        quiet (bool): Don't print a line for each successfully resized image
+        frame_workers (int): Threads resampling the frames of one animation
+        fingerprint (bool): Return each source's size, mtime and digest
+    
+    Yields:
+        tuple: (task, ResizeResult)
+    """
+    for task in tasks:
+        yield task, _resize_chunk([task], resize_kwargs, cache_dir, quiet,
+                                  frame_workers, fingerprint)[0]
+
+
+def _iter_chunks(tasks, chunksize, ramp=0):
+    """
+    Group an iterable of tasks into lists of up to chunksize tasks.
+    
+    With ramp, the first ramp chunks hold one task each and later chunks
+    double in size up to chunksize, so a small batch still reaches every
+    worker while a large one gets fewer, bigger chunks.
+    
+    Args:
+        tasks (iterable): Tasks to group
+        chunksize (int): Maximum tasks per chunk
+        ramp (int): Number of single-task chunks to start with
+    
+    Yields:
+        list: Chunk of tasks
+    """
+    size = 1 if ramp else chunksize
+    chunk = []
+    count = 0
+    for task in tasks:
+        chunk.append(task)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+            count += 1
+            if count >= ramp:
+                size = min(size * 2, chunksize)
+    if chunk:
+        yield chunk
+
+
+def _deal_chunks(tasks, chunksize):
+    """
+    Deal cost-sorted tasks round-robin into chunks of up to chunksize tasks.
+    
+    Cutting a most-expensive-first list into consecutive chunks would put
+    the largest images together in the first chunk, run one after another
+    by a single worker. Dealing spreads them over the first chunks, so each
+    worker starts on one of them.
+    
+    Args:
+        tasks (iterable): Tasks sorted most expensive first
+        chunksize (int): Maximum tasks per chunk
+    
+    Yields:
+        list: Chunk of tasks
+    """
+    tasks = list(tasks)
+    count = -(-len(tasks) // chunksize)
+    for index in range(count):
+        yield tasks[index::count]
+
+
+def _decoded_bytes(task, resize_kwargs, frame_workers=1):
+    """
+    Estimate the memory needed to resize a task's image from its header.
+    
+    A still image needs its decoded bitmap. An animation that stays
+    animated needs a few full-size RGBA frames while they are decoded and
+    resampled, plus every resized frame of each animated output until it
+    is encoded.
+    
+    Args:
+        task (tuple): (input_path, output) tuple from _build_tasks
+        resize_kwargs (dict): Keyword arguments passed to the resize function
+        frame_workers (int): Threads resampling the frames of one animation
+    
+    Returns:
+        int: Estimated bytes, or 0 if the header cannot be read
+    """
+    input_path, output = task
+    try:
+        with Image.open(input_path) as img:
+            decoded = img.width * img.height * len(img.getbands())
+            if not (resize_kwargs.get("animated", True)
+                    and getattr(img, 'is_animated', False)):
+                return decoded
+            original_size, n_frames, source_format = img.size, img.n_frames, img.format
+    except Exception:
+        # The worker reports the error when it tries to open the file
+        return 0
+    
+    # Decoded frame, its conversion and the resampler's copy, or the frames
+    # queued for and held by each thread
+    full_frames = 3 if frame_workers <= 1 else 2 + 3 * frame_workers
+    total = full_frames * original_size[0] * original_size[1] * 4
+    outputs = output if isinstance(output, list) else [resize_kwargs]
+    for spec in outputs:
+        if (spec.get("output_format") or source_format).upper() not in ANIMATED_FORMATS:
+            total += decoded
+            continue
+        width, height = (_calculate_dimensions(
+            original_size, spec.get("width"), spec.get("height"),
+            resize_kwargs.get("maintain_aspect", True)) or original_size)
+        total += n_frames * width * height * 4
+    return total
+
+
+def _run_in_pool(tasks, resize_kwargs, workers, chunksize=None, ordered=True,
+                 cache_dir=None, quiet=False, max_memory=None, executor=None,
+                 frame_workers=1, planned=False, fingerprint=False):
+    """
+    Fan resize tasks out over a process pool in chunks.
+    
+    Tasks are consumed lazily and only a few chunks per worker are kept in
+    flight, so work starts while tasks are still being discovered.
+    
+    With max_memory, each chunk reserves the decoded size of its largest
+    image (a worker holds one image at a time) and is only submitted once
+    the reservations of all in-flight chunks leave room for it. A chunk
+    larger than the whole budget runs on its own.
+    
+    Args:
+        tasks (iterable): (input_path, output) tuples
+        resize_kwargs (dict): Keyword arguments passed to resize_image
+        workers (int): Number of worker processes
+        chunksize (int): Images per submitted task (default: auto; about
+            four chunks per worker for a planned list, otherwise single
+            images growing to DEFAULT_CHUNKSIZE)
+        ordered (bool): Yield results in input order instead of completion order
+        cache_dir (str): Content-addressed output cache folder (None = disabled)
+        quiet (bool): Don't print a line for each successfully resized image
+        max_memory (int): Budget in bytes for the estimated decoded size of
+            all in-flight images (None = unlimited)
+        executor (concurrent.futures.ProcessPoolExecutor): Running pool to
+            submit to instead of starting one; it is left running
+        frame_workers (int): Threads resampling the frames of one animation
+        planned (bool): Tasks are sorted most expensive first; deal them
+            into chunks round-robin (see _deal_chunks), so results come in
+            chunk order rather than task order
+        fingerprint (bool): Have workers return each source's size, mtime
+            and digest
+    
+    Yields:
+        tuple: (task, ResizeResult)
+    """
+    if planned:
+        # The whole list is known, so size chunks from its length
+        tasks = list(tasks)
+        if not chunksize or chunksize < 1:
+            chunksize = max(1, len(tasks) // (workers * 4))
+        chunks = _deal_chunks(tasks, chunksize)
+    elif not chunksize or chunksize < 1:
+        chunks = _iter_chunks(tasks, DEFAULT_CHUNKSIZE, ramp=workers)
+    else:
+        chunks = _iter_chunks(tasks, chunksize)
+    max_in_flight = workers * 2
+    
+    with contextlib.ExitStack() as stack:
+        if executor is None:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+        in_flight = {}
+        reserved = 0
+        
+        for chunk in chunks:
+            chunk_bytes = 0
+            if max_memory:
+                chunk_bytes = max(_decoded_bytes(task, resize_kwargs, frame_workers)
+                                  for task in chunk)
+            
+            while in_flight and (
+                    len(in_flight) >= max_in_flight
+                    or (max_memory and reserved + chunk_bytes > max_memory)):
+                reserved -= yield from _collect_chunks(in_flight, ordered)
+            
+            future = executor.submit(_resize_chunk, chunk, resize_kwargs,
+                                     cache_dir, quiet, frame_workers, fingerprint)
+            in_flight[future] = (chunk, chunk_bytes)
+            reserved += chunk_bytes
+        
+        while in_flight:
+            yield from _collect_chunks(in_flight, ordered)
+
+
+def _collect_chunks(in_flight, ordered):
+    """
+    Wait for in-flight chunks and yield their results.
+    
+    Collected futures are removed from in_flight, so neither they nor
+    their results outlive the chunk.
+    
+    Args:
+        in_flight (dict): Futures mapped to (chunk, reserved bytes), in
+            submission order
+        ordered (bool): Wait for the oldest chunk instead of any chunk
+    
+    Yields:
+        tuple: (task, ResizeResult)
+    
+    Returns:
+        int: Memory reservations released by the collected chunks
+    """
+    if ordered:
+        done = [next(iter(in_flight))]
+    else:
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+    
+    released = 0
+    for future in done:
+        chunk, chunk_bytes = in_flight.pop(future)
+        released += chunk_bytes
+        yield from zip(chunk, future.result())
+    return released
+
+
+def _file_digest(file_path):
+    """
+    Compute the SHA-256 digest of a file's contents.
+    
+    Args:
+        file_path (str): Path to the file
+    
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _fingerprint(file_path):
+    """
+    Stat and hash a source before it is resized.
+    
+    The stat is taken first, so if the file changes while it is being
+    read the recorded mtime is stale and the next run checks it again.
+    
+    Args:
+        file_path (str): Path to the file
+    
+    Returns:
+        tuple: (size, mtime_ns, sha256 hex digest)
+    """
+    stat = os.stat(file_path)
+    return stat.st_size, stat.st_mtime_ns, _file_digest(file_path)
+
+
+def _load_manifest(output_folder):
+    """
+    Load the incremental-mode manifest from the output folder.
+    
+    Args:
+        output_folder (str): Folder holding the manifest
+    
+    Returns:
+        dict: Manifest entries keyed by source path (empty if none exists)
+    """
+    manifest_path = os.path.join(output_folder, MANIFEST_FILENAME)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Warning: Ignoring unreadable manifest {manifest_path}: {str(e)}")
+        return {}
+    
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest.get("entries", {})
+
+
+def _save_manifest(output_folder, manifest):
+    """
+    Atomically write the incremental-mode manifest to the output folder.
+    
+    Args:
+        output_folder (str): Folder holding the manifest
+        manifest (dict): Manifest entries keyed by source path
+    """
+    manifest_path = os.path.join(output_folder, MANIFEST_FILENAME)
+    temp_path = manifest_path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": MANIFEST_VERSION, "entries": manifest}, f)
+    os.replace(temp_path, manifest_path)
+
+
+def _task_outputs(output):
+    """
+    List the output paths written by a task.
+    
+    Args:
+        output: Output path, or a list of rendition dicts
+    
+    Returns:
+        list: Output file paths
+    """
+    if isinstance(output, list):
+        return [rendition['output_path'] for rendition in output]
+    return [output]
+
+
+def _manifest_params(output, resize_kwargs):
+    """
+    Build the JSON-normalized parameters that determine a task's output.
+    
+    Args:
+        output: Output path, or a list of rendition dicts
+        resize_kwargs (dict): Keyword arguments passed to the resize function
+    
+    Returns:
+        dict: Parameters as they round-trip through JSON
+    """
+    return json.loads(json.dumps({"output": output, "resize": resize_kwargs},
+                                 sort_keys=True))
+
+
+def _is_up_to_date(manifest, input_folder, task, resize_kwargs):
+    """
+    Check whether a task's outputs are current according to the manifest.
+    
+    Size and mtime are compared first; the content hash is only computed
+    when they differ, so touched-but-identical sources are still skipped.
+    
+    Args:
+        manifest (dict): Manifest entries keyed by source path
+        input_folder (str): Folder the source paths are relative to
+        task (tuple): (input_path, output) task
+        resize_kwargs (dict): Keyword arguments passed to the resize function
+    
+    Returns:
+        bool: True if the task can be skipped
+    """
+    input_path, output = task
+    key = os.path.relpath(input_path, input_folder)
+    entry = manifest.get(key)
+    if entry is None:
+        return False
+    
+    if entry.get("params") != _manifest_params(output, resize_kwargs):
+        return False
+    if not all(os.path.exists(path) for path in _task_outputs(output)):
+        return False
+    
+    try:
+        stat = os.stat(input_path)
+        if entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return True
+        if entry["size"] != stat.st_size or entry["sha256"] != _file_digest(input_path):
+            return False
+    except OSError:
+        return False
+    
+    # Contents unchanged; refresh the stat so the hash isn't recomputed next run
+    entry["mtime_ns"] = stat.st_mtime_ns
+    return True
+
+
+def _record_manifest_entry(manifest, input_folder, task, resize_kwargs,
+                           fingerprint):
+    """
+    Record a successfully processed task in the manifest.
+    
+    The source is recorded as the worker read it before resizing, so a
+    file that changes mid-resize is processed again on the next run.
+    
+    Args:
+        manifest (dict): Manifest entries keyed by source path
+        input_folder (str): Folder the source paths are relative to
+        task (tuple): (input_path, output) task
+        resize_kwargs (dict): Keyword arguments passed to the resize function
+        fingerprint (tuple): (size, mtime_ns, sha256) from the worker, or
+            None to leave the task unrecorded
+    """
+    if fingerprint is None:
+        return
+    input_path, output = task
+    size, mtime_ns, digest = fingerprint
+    manifest[os.path.relpath(input_path, input_folder)] = {
+        "size": size,
+        "mtime_ns": mtime_ns,
+        "sha256": digest,
+        "params": _manifest_params(output, resize_kwargs),
+    }
+
+
+def _cache_keys(digest, output, resize_kwargs):
+    """
+    Build a cache key for every output file of a task.
+    
+    Args:
+        digest (str): SHA-256 digest of the source file
+        output: Output path, or a list of rendition dicts
+        resize_kwargs (dict): Keyword arguments passed to the resize function
+    
+    Returns:
+        list: (cache_key, output_path) tuples
+    """
+    if isinstance(output, list):
+        entries = []
+        for rendition in output:
+            params = dict(resize_kwargs)
+            params.update({key: value for key, value in rendition.items()
+                           if key != 'output_path'})
+            entries.append((params, rendition['output_path']))
+    else:
+        entries = [(resize_kwargs, output)]
+    
+    keys = []
+    for params, output_path in entries:
+        material = json.dumps({"source": digest, "params": params}, sort_keys=True)
+        keys.append((hashlib.sha256(material.encode('utf-8')).hexdigest(),
+                     output_path))
+    return keys
+
+
+def _cache_path(cache_dir, key, output_path):
+    """
+    Locate a cache entry, sharded by the first two hex digits of its key.
+    
+    Args:
+        cache_dir (str): Cache folder
+        key (str): Cache key
+        output_path (str): Output path (supplies the file extension)
+    
+    Returns:
+        str: Path of the cache entry
     """
-    Get all image files from the specified folder.
+    _, ext = os.path.splitext(output_path)
+    return os.path.join(cache_dir, key[:2], key + ext.lower())
+
+
+def _link_or_copy(source_path, target_path, link=True):
+    """
+    Atomically place source_path at target_path as a hardlink, or a copy
+    when hardlinks are unavailable (e.g. across filesystems).
     
     Args:
-        folder_path (str): Path to the folder containing images
-        extensions (list): List of image extensions to include (default: common formats)
+        source_path (str): Existing file
+        target_path (str): Destination path (replaced if it exists)
+        link (bool): Try a hardlink first (False = always copy)
+    """
+    # Renaming onto another link of the same file does nothing and would
+    # leave the temporary link behind
+    if os.path.exists(target_path) and os.path.samefile(source_path, target_path):
+        return
+    temp_path = f"{target_path}.{os.getpid()}.tmp"
+    if link:
+        try:
+            os.link(source_path, temp_path)
+        except OSError:
+            link = False
+    if not link:
+        shutil.copyfile(source_path, temp_path)
+    os.replace(temp_path, target_path)
+
+
+def _resize_cached(input_path, output, resize_kwargs, cache_dir, quiet=False,
+                   frame_workers=1):
+    """
+    Resize an image through the content-addressed output cache.
+    
+    On a hit every output is linked (or copied) from the cache without
+    decoding the source; on a miss the image is resized and its outputs
+    are added to the cache.
+    
+    Args:
+        input_path (str): Path to input image
+        output: Output path, or a list of renditions for resize_image_renditions
+        resize_kwargs (dict): Keyword arguments passed to the resize function
+        cache_dir (str): Cache folder
+        quiet (bool): Don't print a line for each successfully resized image
+        frame_workers (int): Threads resampling the frames of one animation
     
     Returns:
-        list: List of image file paths
+        ResizeResult: Result record, with status 'cached' on a hit and the
+            source's fingerprint (the hash is needed for the keys anyway)
     """
-    if extensions is None:
-        extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff', '.webp']
+    metrics = {}
+    try:
+        with _stage(metrics, "hash"):
+            metrics["fingerprint"] = _fingerprint(input_path)
+        digest = metrics["fingerprint"][2]
+    except OSError as e:
+        print(f"✗ Error processing {input_path}: {str(e)}")
+        metrics["error"] = str(e)
+        return _make_result(input_path, output, False, metrics)
     
-    image_files = []
+    entries = [(_cache_path(cache_dir, key, output_path), output_path)
+               for key, output_path in _cache_keys(digest, output, resize_kwargs)]
     
-    if not os.path.exists(folder_path):
-        print(f"Error: Folder '{folder_path}' does not exist.")
-        return image_files
+    if all(os.path.exists(cache_path) for cache_path, _ in entries):
+        try:
+            with _stage(metrics, "cache"):
+                for cache_path, output_path in entries:
+                    _link_or_copy(cache_path, output_path)
+                    # Bump mtime so eviction treats the entry as recently used
+                    os.utime(cache_path)
+                    _add_bytes(metrics, "bytes_out", output_path)
+            _add_bytes(metrics, "bytes_in", input_path)
+            if not quiet:
+                print(f"✓ Cached: {os.path.basename(input_path)}")
+            return _make_result(input_path, output, True, metrics, 'cached')
+        except OSError:
+            # Entry evicted mid-read or unreadable; fall back to resizing
+            pass
     
-    for filename in os.listdir(folder_path):
-        file_path = os.path.join(folder_path, filename)
-        if os.path.isfile(file_path):
-            _, ext = os.path.splitext(filename)
-            if ext.lower() in extensions:
-                image_files.append(file_path)
+    result = _resize_task(input_path, output, resize_kwargs, quiet, frame_workers)
+    stages = dict(result.stages or {}, **metrics.get("stages", {}))
+    if not result.ok:
+        return result._replace(stages=stages)
+    result = result._replace(fingerprint=metrics["fingerprint"])
     
-    return image_files
+    store_metrics = {"stages": stages}
+    with _stage(store_metrics, "cache"):
+        for cache_path, output_path in entries:
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                # A linked passthrough output is the source itself; copy it
+                # so that bumping the entry's mtime never touches the source
+                _link_or_copy(output_path, cache_path,
+                              link=not os.path.samefile(output_path, input_path))
+            except OSError as e:
+                print(f"Warning: Could not cache {output_path}: {str(e)}")
+    return result._replace(stages=stages)
 
 
-def resize_image(input_path, output_path, width=None, height=None, 
-                 maintain_aspect=True, quality=95, output_format=None):
+def _prune_cache(cache_dir, max_bytes):
     """
-    Resize a single image.
+    Evict least recently used cache entries until the cache fits max_bytes.
     
     Args:
-        input_path (str): Path to input image
-        output_path (str): Path to save resized image
-        width (int): Target width in pixels
-        height (int): Target height in pixels
-        maintain_aspect (bool): Whether to maintain aspect ratio
-        quality (int): Image quality (1-100) for JPEG
-        output_format (str): Output format (e.g., 'JPEG', 'PNG')
+        cache_dir (str): Cache folder
+        max_bytes (int): Maximum total size of the cache in bytes
     
     Returns:
-        bool: True if successful, False otherwise
+        int: Number of entries evicted
     """
-    try:
-        # Open the image
-        with Image.open(input_path) as img:
-            original_width, original_height = img.size
-            
-            # Calculate new dimensions
-            if width and height:
-                if maintain_aspect:
-                    # Calculate aspect ratio
-                    aspect_ratio = original_width / original_height
-                    
-                    # Determine which dimension to use
-                    if width / height > aspect_ratio:
-                        # Height is the limiting factor
-                        new_height = height
-                        new_width = int(height * aspect_ratio)
-                    else:
-                        # Width is the limiting factor
-                        new_width = width
-                        new_height = int(width / aspect_ratio)
-                else:
-                    new_width = width
-                    new_height = height
-            elif width:
-                # Only width specified
-                aspect_ratio = original_height / original_width
-                new_width = width
-                new_height = int(width * aspect_ratio)
-            elif height:
-                # Only height specified
-                aspect_ratio = original_width / original_height
-                new_height = height
-                new_width = int(height * aspect_ratio)
-            else:
-                print(f"Warning: No dimensions specified for {input_path}")
-                return False
-            
-            # Resize the image
-            resized_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            
-            # Determine output format
-            if output_format is None:
-                output_format = img.format or 'PNG'
-            
-            # Save the image
-            if output_format.upper() in ['JPEG', 'JPG']:
-                # Convert to RGB if necessary (JPEG doesn't support transparency)
-                if resized_img.mode in ('RGBA', 'LA', 'P'):
-                    rgb_img = Image.new('RGB', resized_img.size, (255, 255, 255))
-                    if resized_img.mode == 'P':
-                        resized_img = resized_img.convert('RGBA')
-                    rgb_img.paste(resized_img, mask=resized_img.split()[-1] if resized_img.mode == 'RGBA' else None)
-                    resized_img = rgb_img
-                resized_img.save(output_path, format=output_format, quality=quality, optimize=True)
-            else:
-                resized_img.save(output_path, format=output_format)
-            
-            print(f"✓ Resized: {os.path.basename(input_path)} "
-                  f"({original_width}x{original_height} → {new_width}x{new_height})")
-            return True
-            
-    except Exception as e:
-        print(f"✗ Error processing {input_path}: {str(e)}")
-        return False
+    entries = []
+    total_bytes = 0
+    for root, _, filenames in os.walk(cache_dir):
+        for filename in filenames:
+            path = os.path.join(root, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_bytes += stat.st_size
+    
+    evicted = 0
+    entries.sort()
+    for _, size, path in entries:
+        if total_bytes <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total_bytes -= size
+        evicted += 1
+    return evicted
 
 
 def batch_resize_images(input_folder, output_folder, width=None, height=None,
                         maintain_aspect=True, quality=95, output_format=None,
-                        prefix="", suffix=""):
+                        prefix="", suffix="", workers=1, chunksize=None,
+                        ordered=True, draft=True, reducing_gap=None,
+                        sizes=None, incremental=False, cache_dir=None,
+                        cache_max_bytes=DEFAULT_CACHE_MAX_BYTES,
+                        recursive=False, timings=False, metrics_file=None,
+                        quiet=False, background=DEFAULT_BACKGROUND,
+                        flatten_first=True, resample=DEFAULT_RESAMPLE,
+                        encode_speed=DEFAULT_ENCODE_SPEED, max_bytes=None,
+                        passthrough=None, plan=False, max_memory=None,
+                        stream=False, animated=True, frame_workers=1,
+                        executor=None):
     """
     Resize all images in a folder.
     
+    When sizes is given, every image is decoded once and written at each
+    size into its own subfolder of output_folder (e.g. output/300/).
+    
     Args:
         input_folder (str): Folder containing input images
         output_folder (str): Folder to save resized images
@@ -144,67 +2283,697 @@ def batch_resize_images(input_folder, output_folder, width=None, height=None,
         output_format (str): Output format (e.g., 'JPEG', 'PNG')
         prefix (str): Prefix to add to output filenames
         suffix (str): Suffix to add to output filenames
+        workers (int): Number of worker processes (1 = serial, 0/None = all CPUs)
+        chunksize (int): Images per task submitted to the pool (default:
+            auto, see _run_in_pool)
+        ordered (bool): Collect pool results in input order
+        draft (bool): Let libjpeg downscale JPEG sources while decoding
+        reducing_gap (float): Integer box-reduction gap passed to resize_image
+        sizes (list): List of (width, height) or (width, height, format)
+            tuples to render from a single decode; overrides width/height
+        incremental (bool): Skip images whose outputs are up to date according
+            to the manifest kept in output_folder
+        cache_dir (str): Content-addressed cache of resized outputs, shared
+            between runs and folders (None = disabled)
+        cache_max_bytes (int): Size limit of cache_dir; least recently used
+            entries are evicted after the batch
+        recursive (bool): Include subfolders, mirroring their structure in
+            output_folder
+        timings (bool): Add per-stage wall/CPU totals ('timings') and
+            'bytes_in'/'bytes_out' to the returned statistics
+        metrics_file (str): Append one JSON line of per-image metrics to this
+            file (implies timings)
+        quiet (bool): Don't print a line for each successfully resized image
+        background (tuple): RGB color transparent areas are flattened onto
+            when saving to a format without alpha (default: white)
+        flatten_first (bool): For output formats without alpha, drop or
+            flatten transparency before resizing rather than after
+        resample: Resampling filter name from RESAMPLE_FILTERS or a
+            PIL.Image.Resampling value (default: 'lanczos')
+        encode_speed (str): Encoder profile: 'fast', 'default' or 'small'
+            (see resize_image)
+        max_bytes (int): Size budget for JPEG/WebP outputs; quality is
+            searched downwards from quality (see resize_image)
+        passthrough (str): Never upscale; images already within the target
+            size are copied ('copy') or hardlinked ('link') to the output
+            folder unchanged (see resize_image)
+        plan (bool): Read every header before starting, fail unreadable
+            files up front and process the most expensive images first
+            (see plan_images); resizing starts only once discovery is done
+        max_memory (int): With workers > 1, cap the estimated decoded size
+            (width * height * bands) of all in-flight images at this many
+            bytes, holding back work until it fits (None = unlimited)
+        stream (bool): Downscale uncompressed TIFF and BMP sources in bands
+            of rows instead of decoding them whole (see resize_image)
+        animated (bool): Keep every frame of animated GIF and WebP sources
+            saved as GIF or WebP (False = first frame only)
+        frame_workers (int): Threads resampling the frames of one animation
+            in parallel (within each worker process)
+        executor (concurrent.futures.ProcessPoolExecutor): Already running
+            process pool to use instead of starting one for this batch (as
+            resize_daemon does to keep workers warm); workers should then
+            be its size, and only sets how much work is kept in flight
     
     Returns:
         dict: Statistics about the operation
     """
+    stats = _new_stats(timings or metrics_file)
+    
+    image_files = _discover_images(input_folder, output_folder, recursive,
+                                   cache_dir)
+    if image_files is None:
+        return stats
+    
+    if workers is None or workers < 1:
+        workers = os.cpu_count() or 1
+    
+    _print_batch_header(input_folder, output_folder, width, height,
+                        maintain_aspect, sizes, recursive)
+    if workers > 1:
+        print(f"Workers: {workers}")
+        if max_memory:
+            print(f"Memory budget: {max_memory / (1024 * 1024):.0f} MB")
+    print("-" * 60)
+    
+    results = _iter_results(
+        image_files, input_folder, output_folder, workers=workers,
+        chunksize=chunksize, ordered=ordered, incremental=incremental,
+        cache_dir=cache_dir, cache_max_bytes=cache_max_bytes,
+        recursive=recursive, quiet=quiet, plan=plan, max_memory=max_memory,
+        executor=executor, width=width, height=height, maintain_aspect=maintain_aspect,
+        quality=quality, output_format=output_format, prefix=prefix,
+        suffix=suffix,
+        draft=draft, reducing_gap=reducing_gap, sizes=sizes,
+        background=background, flatten_first=flatten_first,
+        resample=resample, encode_speed=encode_speed, max_bytes=max_bytes,
+        passthrough=passthrough, stream=stream, animated=animated,
+        frame_workers=frame_workers)
+    
+    metrics_out = open(metrics_file, 'a', encoding='utf-8') if metrics_file else None
+    try:
+        for result in results:
+            _record_result(stats, result, metrics_out)
+    finally:
+        if metrics_out is not None:
+            metrics_out.close()
+    
+    _print_summary(stats)
+    return stats
+
+
+def iter_resize_images(input_folder, output_folder, workers=1, chunksize=None,
+                       ordered=True, incremental=False, cache_dir=None,
+                       cache_max_bytes=DEFAULT_CACHE_MAX_BYTES, recursive=False,
+                       quiet=True, plan=False, max_memory=None, executor=None,
+                       **options):
+    """
+    Resize all images in a folder, yielding a result as each one finishes.
+    
+    Works like batch_resize_images but prints no header or summary and
+    keeps no totals, so callers can stream results for very large batches.
+    Images skipped by incremental mode are yielded with status 'skipped'.
+    
+    Args:
+        input_folder (str): Folder containing input images
+        output_folder (str): Folder to save resized images
+        workers, chunksize, ordered, incremental, cache_dir,
+            cache_max_bytes, recursive, plan, max_memory, executor: As for
+            batch_resize_images
+        quiet (bool): Don't print a line for each successfully resized image
+        **options: width, height, maintain_aspect, quality, output_format,
+            prefix, suffix, draft, reducing_gap, sizes, background,
+            flatten_first, resample, encode_speed, max_bytes, passthrough,
+            stream, animated and frame_workers, as for batch_resize_images
+    
+    Yields:
+        ResizeResult: One record per discovered image
+    """
+    image_files = _discover_images(input_folder, output_folder, recursive,
+                                   cache_dir)
+    if image_files is None:
+        return
+    
+    if workers is None or workers < 1:
+        workers = os.cpu_count() or 1
+    
+    yield from _iter_results(image_files, input_folder, output_folder, workers,
+                             chunksize, ordered, incremental, cache_dir,
+                             cache_max_bytes, recursive, quiet, plan, max_memory,
+                             executor, **options)
+
+
+def _iter_results(image_files, input_folder, output_folder, workers=1,
+                  chunksize=None, ordered=True, incremental=False,
+                  cache_dir=None, cache_max_bytes=DEFAULT_CACHE_MAX_BYTES,
+                  recursive=False, quiet=False, plan=False, max_memory=None,
+                  executor=None, **options):
+    """
+    Run a batch over discovered images and yield its results.
+    
+    Owns the incremental manifest and the cache trimming, so both are
+    handled the same way for batch_resize_images and iter_resize_images.
+    
+    Args:
+        image_files (iterable): Image paths
+        (remaining arguments as for iter_resize_images)
+    
+    Yields:
+        ResizeResult: One record per image
+    """
+    if plan:
+        planned, rejected = plan_images(image_files)
+        if not quiet:
+            total_seconds = sum(image.cost for image in planned) / 1000
+            print(f"Planned {len(planned)} images (~{total_seconds:.1f}s of "
+                  f"single-core work), largest first")
+        for path, error in rejected:
+            print(f"✗ Error processing {path}: {error}")
+            yield ResizeResult(path, None, 'failed', error=error)
+        image_files = [image.path for image in planned]
+    
+    # Only changes how fast an image is made, so stays out of the
+    # manifest and cache keys
+    frame_workers = options.pop('frame_workers', 1)
+    tasks, resize_kwargs = _build_tasks(image_files, input_folder, output_folder,
+                                        recursive=recursive, **options)
+    
+    manifest = None
+    if incremental:
+        manifest = _load_manifest(output_folder)
+    
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    skipped = deque()
+    tasks = _skip_own_outputs(tasks, input_folder, output_folder)
+    tasks = _iter_pending(tasks, skipped, manifest, input_folder, resize_kwargs)
+    
+    if workers == 1 and executor is None:
+        results = _run_serial(tasks, resize_kwargs, cache_dir, quiet,
+                              frame_workers, incremental)
+    else:
+        results = _run_in_pool(tasks, resize_kwargs, workers, chunksize, ordered,
+                               cache_dir, quiet, max_memory, executor,
+                               frame_workers, plan, incremental)
+    
+    try:
+        for task, result in results:
+            while skipped:
+                yield skipped.popleft()
+            if result.ok and manifest is not None:
+                _record_manifest_entry(manifest, input_folder, task, resize_kwargs,
+                                       result.fingerprint)
+            yield result
+        while skipped:
+            yield skipped.popleft()
+    finally:
+        # Save progress even if the batch is interrupted part way through
+        if manifest is not None:
+            _save_manifest(output_folder, manifest)
+    
+    if cache_dir:
+        evicted = _prune_cache(cache_dir, cache_max_bytes)
+        if evicted:
+            print(f"Evicted {evicted} entries from cache '{cache_dir}'")
+
+
+def _discover_images(input_folder, output_folder, recursive=False,
+                     cache_dir=None):
+    """
+    Start lazy image discovery for a batch.
+    
+    Creates the output folder and peeks at the first image so an empty or
+    missing input folder is reported before any work is scheduled.
+    
+    Args:
+        input_folder (str): Folder containing input images
+        output_folder (str): Folder to save resized images
+        recursive (bool): Include subfolders
+        cache_dir (str): Cache folder to exclude from discovery
+    
+    Returns:
+        iterator: Image paths, or None if there is nothing to process
+    """
     # Create output folder if it doesn't exist
     os.makedirs(output_folder, exist_ok=True)
     
-    # Get all images from input folder
-    image_files = get_images_from_folder(input_folder)
+    if not os.path.exists(input_folder):
+        print(f"Error: Folder '{input_folder}' does not exist.")
+        return None
     
-    if not image_files:
-        print(f"No images found in '{input_folder}'")
-        return {"total": 0, "success": 0, "failed": 0}
+    # Discover images lazily so resizing starts while the tree is walked
+    image_files = iter_images_from_folder(input_folder, recursive=recursive,
+                                          exclude=[output_folder, cache_dir])
+    first_image = next(image_files, None)
     
-    print(f"\nFound {len(image_files)} images in '{input_folder}'")
+    if first_image is None:
+        print(f"No images found in '{input_folder}'")
+        return None
+    return itertools.chain([first_image], image_files)
+
+
+def _print_batch_header(input_folder, output_folder, width, height,
+                        maintain_aspect, sizes, recursive):
+    """Print the settings of a batch before it starts."""
+    print(f"\nInput folder: '{input_folder}'" + (" (recursive)" if recursive else ""))
     print(f"Output folder: '{output_folder}'")
-    print(f"Target size: {width or 'auto'}x{height or 'auto'}")
+    if sizes:
+        print("Target sizes: " + ", ".join(
+            f"{size[0] or 'auto'}x{size[1] or 'auto'}" for size in sizes))
+    else:
+        print(f"Target size: {width or 'auto'}x{height or 'auto'}")
     print(f"Maintain aspect ratio: {maintain_aspect}")
-    print("-" * 60)
+
+
+def _build_tasks(image_files, input_folder, output_folder, width=None,
+                 height=None, maintain_aspect=True, quality=95,
+                 output_format=None, prefix="", suffix="", draft=True,
+                 reducing_gap=None, sizes=None, recursive=False,
+                 background=DEFAULT_BACKGROUND, flatten_first=True,
+                 resample=DEFAULT_RESAMPLE, encode_speed=DEFAULT_ENCODE_SPEED,
+                 max_bytes=None, passthrough=None, stream=False,
+                 animated=True):
+    """
+    Turn a stream of image paths into resize tasks.
     
-    success_count = 0
-    failed_count = 0
+    Args:
+        image_files (iterable): Image paths
+        input_folder (str): Folder containing input images
+        output_folder (str): Folder to save resized images
+        (remaining arguments as for batch_resize_images)
     
-    for image_path in image_files:
-        filename = os.path.basename(image_path)
-        name, ext = os.path.splitext(filename)
-        
-        # Determine output extension
-        if output_format:
-            if output_format.upper() in ['JPEG', 'JPG']:
-                output_ext = '.jpg'
-            else:
-                output_ext = f'.{output_format.lower()}'
-        else:
-            output_ext = ext
+    Returns:
+        tuple: (tasks, resize_kwargs) where tasks lazily yields
+            (input_path, output) tuples and resize_kwargs are the keyword
+            arguments for the matching resize function
+    """
+    resize_kwargs = {
+        "maintain_aspect": maintain_aspect,
+        "quality": quality,
+        "draft": draft,
+        "reducing_gap": reducing_gap,
+        "background": tuple(background),
+        "flatten_first": flatten_first,
+        # Stored by name so manifest and cache keys stay readable
+        "resample": _resample_filter(resample).name.lower(),
+        "encode_speed": encode_speed,
+        "max_bytes": max_bytes,
+        "passthrough": passthrough,
+        "stream": stream,
+        "animated": animated,
+    }
+    _encoder_options('JPEG', encode_speed)  # reject unknown profiles up front
+    mirror_root = input_folder if recursive else None
+    
+    if sizes:
+        size_specs = []
+        for size in sizes:
+            size_width, size_height = size[0], size[1]
+            size_format = size[2] if len(size) > 2 and size[2] else output_format
+            size_folder = os.path.join(output_folder,
+                                       _size_label(size_width, size_height))
+            os.makedirs(size_folder, exist_ok=True)
+            size_specs.append((size_width, size_height, size_format, size_folder))
         
-        # Create output filename with prefix/suffix
-        output_filename = f"{prefix}{name}{suffix}{output_ext}"
-        output_path = os.path.join(output_folder, output_filename)
+        tasks = (
+            (image_path, [
+                {
+                    "output_path": _build_output_path(image_path, size_folder,
+                                                      size_format, prefix, suffix,
+                                                      mirror_root),
+                    "width": size_width,
+                    "height": size_height,
+                    "output_format": size_format,
+                }
+                for size_width, size_height, size_format, size_folder in size_specs
+            ])
+            for image_path in image_files
+        )
+    else:
+        tasks = (
+            (image_path, _build_output_path(image_path, output_folder,
+                                            output_format, prefix, suffix,
+                                            mirror_root))
+            for image_path in image_files
+        )
+        resize_kwargs.update({
+            "width": width,
+            "height": height,
+            "output_format": output_format,
+        })
+    
+    return tasks, resize_kwargs
+
+
+def _new_stats(timings=False):
+    """
+    Create an empty batch statistics dict.
+    
+    Args:
+        timings (bool): Include per-stage timing and byte totals
+    
+    Returns:
+        dict: Statistics with all counters at zero
+    """
+    stats = {"total": 0, "success": 0, "failed": 0, "skipped": 0, "copied": 0}
+    if timings:
+        stats.update({"timings": {}, "bytes_in": 0, "bytes_out": 0})
+    return stats
+
+
+def _record_result(stats, result, metrics_out=None):
+    """
+    Add a result to the batch statistics and the metrics file.
+    
+    Args:
+        stats (dict): Batch statistics
+        result (ResizeResult): Result of one image
+        metrics_out (file): Open JSON-lines metrics file (None = disabled)
+    """
+    stats["total"] += 1
+    if result.status == 'skipped':
+        stats["skipped"] += 1
+        return
+    if result.ok:
+        stats["success"] += 1
+        if result.status == 'copied':
+            stats["copied"] += 1
+    else:
+        stats["failed"] += 1
+    
+    if "timings" in stats:
+        for name, stage in (result.stages or {}).items():
+            total = stats["timings"].setdefault(name, {"wall": 0.0, "cpu": 0.0})
+            total["wall"] += stage["wall"]
+            total["cpu"] += stage["cpu"]
+        stats["bytes_in"] += result.bytes_in
+        stats["bytes_out"] += result.bytes_out
+    
+    if metrics_out is not None:
+        metrics_out.write(json.dumps(result._asdict()) + "\n")
+
+
+def _print_summary(stats, file=None):
+    """
+    Print the batch summary.
+    
+    Args:
+        stats (dict): Batch statistics
+        file: Text stream to print to (default: sys.stdout)
+    """
+    print("-" * 60, file=file)
+    print(f"\nFound {stats['total']} images", file=file)
+    print(f"✅ Completed: {stats['success']} images resized successfully", file=file)
+    if stats["copied"] > 0:
+        print(f"📋 Copied: {stats['copied']} images already within the target size",
+              file=file)
+    if stats["skipped"] > 0:
+        print(f"⏭️  Skipped: {stats['skipped']} unchanged images", file=file)
+    if stats["failed"] > 0:
+        print(f"❌ Failed: {stats['failed']} images", file=file)
+    
+    if "timings" in stats:
+        print(f"\nStage timings (summed over images, "
+              f"{stats['bytes_in'] / 1e6:.2f} MB in → {stats['bytes_out'] / 1e6:.2f} MB out):",
+              file=file)
+        for name, stage in sorted(stats["timings"].items(),
+                                  key=lambda item: -item[1]["wall"]):
+            print(f"  {name:<8} {stage['wall']:8.3f}s wall  {stage['cpu']:8.3f}s CPU",
+                  file=file)
+
+
+def _skip_own_outputs(tasks, input_folder, output_folder):
+    """
+    Drop tasks whose source is an output written earlier in the batch.
+    
+    Discovery is lazy, so when outputs are written inside the folder being
+    scanned (e.g. -i photos -o photos --suffix _t) it would otherwise find
+    them and resize them again.
+    
+    Args:
+        tasks (iterable): (input_path, output) tuples
+        input_folder (str): Folder being scanned
+        output_folder (str): Folder outputs are written to
+    
+    Yields:
+        tuple: (input_path, output) tuples for the original images
+    """
+    input_root = os.path.realpath(input_folder)
+    output_root = os.path.realpath(output_folder)
+    if output_root != input_root and not output_root.startswith(input_root + os.sep):
+        yield from tasks
+        return
+    
+    written = set()
+    for input_path, output in tasks:
+        if os.path.realpath(input_path) in written:
+            continue
+        written.update(os.path.realpath(path) for path in _task_outputs(output))
+        yield input_path, output
+
+
+def _iter_pending(tasks, skipped, manifest, input_folder, resize_kwargs):
+    """
+    Drop tasks that are up to date as they stream past.
+    
+    Output subfolders are created here, in the parent process, so workers
+    never race on makedirs.
+    
+    Args:
+        tasks (iterable): (input_path, output) tuples
+        skipped (collections.deque): Receives a 'skipped' ResizeResult for
+            every task dropped
+        manifest (dict): Incremental-mode manifest (None = process everything)
+        input_folder (str): Folder the source paths are relative to
+        resize_kwargs (dict): Keyword arguments passed to the resize function
+    
+    Yields:
+        tuple: Tasks that need processing
+    """
+    created_folders = set()
+    
+    for task in tasks:
+        if manifest is not None and _is_up_to_date(manifest, input_folder, task,
+                                                   resize_kwargs):
+            skipped.append(ResizeResult(task[0], _output_paths(task[1]), 'skipped'))
+            continue
         
-        # Resize the image
-        if resize_image(image_path, output_path, width, height, 
-                       maintain_aspect, quality, output_format):
-            success_count += 1
-        else:
-            failed_count += 1
+        for output_path in _task_outputs(task[1]):
+            folder = os.path.dirname(output_path)
+            if folder not in created_folders:
+                os.makedirs(folder, exist_ok=True)
+                created_folders.add(folder)
+        yield task
+
+
+def _get_async_executor():
+    """
+    Return the shared bounded executor used by the async API.
+    
+    Pillow releases the GIL while decoding, resampling and encoding, so a
+    thread pool sized to the CPU count runs images in parallel without
+    the pickling cost of a process pool.
+    
+    Returns:
+        concurrent.futures.ThreadPoolExecutor: Shared executor
+    """
+    global _async_executor
+    if _async_executor is None:
+        _async_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1,
+                                             thread_name_prefix='image_resizer')
+    return _async_executor
+
+
+async def resize_image_async(input_path, output_path, *args, executor=None,
+                             **kwargs):
+    """
+    Resize a single image without blocking the event loop.
+    
+    Takes the same arguments as resize_image. If the awaiting task is
+    cancelled before the image is picked up, the work is dropped; an image
+    that is already being resized runs to completion in the background.
+    
+    Args:
+        input_path (str): Path to input image
+        output_path (str): Path to save resized image
+        executor (concurrent.futures.Executor): Executor to run in
+            (default: shared thread pool sized to the CPU count)
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor or _get_async_executor(),
+        functools.partial(resize_image, input_path, output_path, *args, **kwargs))
+
+
+async def batch_resize_images_async(input_folder, output_folder, concurrency=None,
+                                    executor=None, incremental=False,
+                                    cache_dir=None,
+                                    cache_max_bytes=DEFAULT_CACHE_MAX_BYTES,
+                                    recursive=False, timings=False,
+                                    metrics_file=None, quiet=False, **options):
+    """
+    Resize all images in a folder without blocking the event loop.
+    
+    Folder discovery and per-image work both run in executors; at most
+    concurrency images are in flight at once. Cancelling the batch cancels
+    images that have not started yet and still saves the manifest.
+    
+    Args:
+        input_folder (str): Folder containing input images
+        output_folder (str): Folder to save resized images
+        concurrency (int): Maximum images in flight (default: CPU count)
+        executor (concurrent.futures.Executor): Executor for resize work
+            (default: shared thread pool sized to the CPU count)
+        incremental (bool): Skip images that are up to date (see batch_resize_images)
+        cache_dir (str): Content-addressed output cache folder (None = disabled)
+        cache_max_bytes (int): Size limit of cache_dir
+        recursive (bool): Include subfolders, mirroring their structure
+        timings (bool): Add per-stage timing totals to the statistics
+        metrics_file (str): Append per-image JSON-lines metrics to this file
+        quiet (bool): Don't print a line for each successfully resized image
+        **options: width, height, maintain_aspect, quality, output_format,
+            prefix, suffix, draft, reducing_gap, sizes, background,
+            flatten_first, resample, encode_speed, max_bytes, passthrough,
+            stream, animated and frame_workers, as for batch_resize_images
+    
+    Returns:
+        dict: Statistics about the operation
+    """
+    loop = asyncio.get_running_loop()
+    executor = executor or _get_async_executor()
+    concurrency = concurrency or os.cpu_count() or 1
+    
+    stats = _new_stats(timings or metrics_file)
     
+    image_files = await loop.run_in_executor(
+        None, _discover_images, input_folder, output_folder, recursive, cache_dir)
+    if image_files is None:
+        return stats
+    
+    _print_batch_header(input_folder, output_folder, options.get('width'),
+                        options.get('height'), options.get('maintain_aspect', True),
+                        options.get('sizes'), recursive)
     print("-" * 60)
-    print(f"\n✅ Completed: {success_count} images resized successfully")
-    if failed_count > 0:
-        print(f"❌ Failed: {failed_count} images")
-    
-    return {
-        "total": len(image_files),
-        "success": success_count,
-        "failed": failed_count
-    }
+    
+    frame_workers = options.pop('frame_workers', 1)
+    tasks, resize_kwargs = _build_tasks(image_files, input_folder, output_folder,
+                                        recursive=recursive, **options)
+    
+    manifest = None
+    if incremental:
+        manifest = _load_manifest(output_folder)
+    
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    skipped = deque()
+    tasks = _skip_own_outputs(tasks, input_folder, output_folder)
+    tasks = _iter_pending(tasks, skipped, manifest, input_folder, resize_kwargs)
+    metrics_out = open(metrics_file, 'a', encoding='utf-8') if metrics_file else None
+    in_flight = {}
+    
+    try:
+        while True:
+            # Pull the next task off the loop; discovery and incremental
+            # hashing touch the filesystem
+            task = await loop.run_in_executor(None, next, tasks, None)
+            while skipped:
+                _record_result(stats, skipped.popleft(), metrics_out)
+            if task is None:
+                break
+            
+            future = loop.run_in_executor(executor, _resize_chunk, [task],
+                                          resize_kwargs, cache_dir, quiet,
+                                          frame_workers, incremental)
+            in_flight[future] = task
+            
+            if len(in_flight) >= concurrency:
+                await _collect_async(in_flight, stats, manifest, input_folder,
+                                     resize_kwargs, metrics_out)
+        
+        while in_flight:
+            await _collect_async(in_flight, stats, manifest, input_folder,
+                                 resize_kwargs, metrics_out)
+    finally:
+        for future in in_flight:
+            future.cancel()
+        if manifest is not None:
+            _save_manifest(output_folder, manifest)
+        if metrics_out is not None:
+            metrics_out.close()
+    
+    if cache_dir:
+        evicted = await loop.run_in_executor(None, _prune_cache, cache_dir,
+                                             cache_max_bytes)
+        if evicted:
+            print(f"Evicted {evicted} entries from cache '{cache_dir}'")
+    
+    _print_summary(stats)
+    return stats
 
 
-def main():
-    """Main function to handle command-line arguments."""
+async def _collect_async(in_flight, stats, manifest, input_folder, resize_kwargs,
+                         metrics_out=None):
+    """
+    Wait for at least one in-flight image and record its result.
+    
+    Args:
+        in_flight (dict): Futures mapped to their tasks; collected futures
+            are removed
+        stats (dict): Batch statistics
+        manifest (dict): Incremental-mode manifest (None = disabled)
+        input_folder (str): Folder the source paths are relative to
+        resize_kwargs (dict): Keyword arguments passed to the resize function
+        metrics_out (file): Open JSON-lines metrics file (None = disabled)
+    """
+    done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+    for future in done:
+        task = in_flight.pop(future)
+        result = future.result()[0]
+        if result.ok and manifest is not None:
+            _record_manifest_entry(manifest, input_folder, task, resize_kwargs,
+                                   result.fingerprint)
+        _record_result(stats, result, metrics_out)
+
+
+def parse_size_spec(spec):
+    """
+    Parse a rendition size such as '800', 'x600', '800x600' or '300:JPEG'.
+    
+    Args:
+        spec (str): Size specification
+    
+    Returns:
+        tuple: (width, height, output_format); missing parts are None
+    
+    Raises:
+        ValueError: If the specification is malformed
+    """
+    size, _, output_format = spec.partition(':')
+    width_text, _, height_text = size.lower().partition('x')
+    
+    try:
+        width = int(width_text) if width_text else None
+        height = int(height_text) if height_text else None
+    except ValueError:
+        raise ValueError(f"Invalid size '{spec}'")
+    
+    if not width and not height:
+        raise ValueError(f"Invalid size '{spec}': no width or height given")
+    
+    if output_format:
+        output_format = output_format.upper()
+        if output_format not in SUPPORTED_OUTPUT_FORMATS:
+            raise ValueError(f"Invalid format '{output_format}' in size '{spec}'")
+    
+    return width, height, output_format or None
+
+
+def _build_parser():
+    """Build the command-line argument parser."""
     parser = argparse.ArgumentParser(
         description="Batch Image Resizer Tool - Resize and convert images in bulk",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -221,6 +2990,39 @@ Examples:
   
   # Resize with prefix and suffix
   python image_resizer.py -i input -o output -w 500 --prefix "thumb_" --suffix "_small"
+  
+  # Create 300px, 800px and 1200px renditions from a single decode
+  python image_resizer.py -i photos -o renditions --sizes 300 800 1200:WEBP
+  
+  # Resize a whole directory tree, keeping its folder structure
+  python image_resizer.py -i photos -o resized -w 800 -r
+  
+  # Only process images that changed since the last run
+  python image_resizer.py -i photos -o resized -w 800 --incremental
+  
+  # Resize using 8 worker processes
+  python image_resizer.py -i photos -o resized -w 800 -j 8
+  
+  # Downscale huge uncompressed TIFF scans without loading them whole
+  python image_resizer.py -i scans -o previews -w 2000 --stream
+  
+  # Keep decoded images of 4 workers within 2 GB
+  python image_resizer.py -i scans -o resized -w 2000 -j 4 --max-memory 2048
+  
+  # Schedule the largest images first to avoid stragglers
+  python image_resizer.py -i photos -o resized -w 800 -j 8 --plan
+  
+  # Fast preview thumbnails (bilinear filter after an integer reduce)
+  python image_resizer.py -i photos -o previews -w 200 --preset fast
+  
+  # Rerun over a mixed folder, copying images that are already small enough
+  python image_resizer.py -i photos -o resized -w 1200 --passthrough
+  
+  # Keep every JPEG under 150 KB
+  python image_resizer.py -i photos -o mobile -w 1080 -f JPEG --max-kb 150
+  
+  # Favour encode speed over file size
+  python image_resizer.py -i photos -o previews -w 200 -f PNG --encode-speed fast
         """
     )
     
@@ -228,33 +3030,144 @@ Examples:
                        help='Input folder containing images')
     parser.add_argument('-o', '--output', required=True,
                        help='Output folder for resized images')
+    parser.add_argument('-r', '--recursive', action='store_true',
+                       help='Include subfolders, mirroring their structure in the output folder')
     parser.add_argument('-w', '--width', type=int,
                        help='Target width in pixels')
     parser.add_argument('-ht', '--height', type=int,
                        help='Target height in pixels')
+    parser.add_argument('--sizes', nargs='+', metavar='SIZE',
+                       help='Render several sizes from one decode, each into its own '
+                            'subfolder (WIDTH, xHEIGHT or WIDTHxHEIGHT, optionally '
+                            'followed by :FORMAT, e.g. 300 800x600 1200:WEBP)')
     parser.add_argument('--no-aspect', action='store_true',
                        help='Do not maintain aspect ratio')
     parser.add_argument('-q', '--quality', type=int, default=95,
                        help='Image quality for JPEG (1-100, default: 95)')
     parser.add_argument('-f', '--format', 
-                       choices=['JPEG', 'PNG', 'BMP', 'WEBP', 'TIFF'],
+                       choices=SUPPORTED_OUTPUT_FORMATS,
                        help='Output image format')
+    parser.add_argument('--encode-speed', choices=list(ENCODE_PROFILES),
+                       default=DEFAULT_ENCODE_SPEED,
+                       help='Encoder profile: fast (quickest encode, larger files), '
+                            'default, or small (slowest encode, smallest files)')
+    parser.add_argument('--max-kb', type=int,
+                       help='Keep JPEG/WebP outputs under this many KB by lowering '
+                            'the quality (at most -q) as far as needed')
+    parser.add_argument('--passthrough', nargs='?', const='copy',
+                       choices=PASSTHROUGH_MODES,
+                       help='Never upscale: copy images already within the target '
+                            'size (or hardlink them with --passthrough link) '
+                            'instead of re-encoding')
+    parser.add_argument('--background', default='white',
+                       help='Color transparent areas are flattened onto for JPEG '
+                            'output (name or #rrggbb, default: white)')
+    parser.add_argument('--no-flatten-first', action='store_true',
+                       help='Resize transparent images with their alpha band and '
+                            'flatten only when saving as JPEG')
     parser.add_argument('--prefix', default='',
                        help='Prefix for output filenames')
     parser.add_argument('--suffix', default='',
                        help='Suffix for output filenames (before extension)')
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                       help='Number of worker processes (0 = all CPUs, default: 1)')
+    parser.add_argument('--chunksize', type=int,
+                       help='Images per task submitted to each worker (default: auto)')
+    parser.add_argument('--unordered', action='store_true',
+                       help='Collect worker results as they complete')
+    parser.add_argument('--stream', action='store_true',
+                       help='Downscale uncompressed TIFF/BMP images in bands of rows '
+                            'instead of decoding them whole')
+    parser.add_argument('--no-animation', action='store_true',
+                       help='Keep only the first frame of animated GIF/WebP images')
+    parser.add_argument('--frame-workers', type=int, default=1,
+                       help='Threads resizing the frames of each animated image '
+                            '(default: 1)')
+    parser.add_argument('--max-memory', type=int,
+                       help='With -j, limit the estimated decoded size of images '
+                            'being processed at once to this many MB')
+    parser.add_argument('--plan', action='store_true',
+                       help='Read all image headers first, reject unreadable files '
+                            'and process the largest images first')
+    parser.add_argument('--no-draft', action='store_true',
+                       help='Fully decode JPEG sources before resizing')
+    parser.add_argument('--reducing-gap', type=float,
+                       help='Box-reduce large images first, keeping this multiple '
+                            'of the target size for the final filter (e.g. 2.0)')
+    parser.add_argument('--filter', choices=list(RESAMPLE_FILTERS),
+                       help='Resampling filter (default: lanczos)')
+    parser.add_argument('--preset', choices=list(PRESETS),
+                       help='Pick filter and reducing gap together: fast (bilinear, '
+                            'gap 2.0), balanced (bicubic, gap 3.0) or best '
+                            '(lanczos, single pass); --filter and --reducing-gap '
+                            'override it')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Skip images that are unchanged since the last run '
+                            '(tracked in a manifest in the output folder)')
+    parser.add_argument('--cache-dir',
+                       help='Reuse resized outputs for identical sources from this '
+                            'content-addressed cache folder')
+    parser.add_argument('--cache-size', type=int,
+                       default=DEFAULT_CACHE_MAX_BYTES // (1024 * 1024),
+                       help='Cache size limit in MB (default: 1024)')
+    parser.add_argument('--timings', action='store_true',
+                       help='Print per-stage timing totals (open, decode, resize, ...)')
+    parser.add_argument('--metrics-file',
+                       help='Append per-image stage timings as JSON lines to this file')
+    parser.add_argument('--quiet', action='store_true',
+                       help='Only print errors and the summary, not a line per image')
+    return parser
+
+
+def _parse_batch_options(parser, argv=None):
+    """
+    Parse and validate command-line arguments into batch options.
+    
+    Args:
+        parser (argparse.ArgumentParser): Parser from _build_parser
+        argv (list): Arguments to parse (default: sys.argv[1:])
     
-    args = parser.parse_args()
+    Returns:
+        dict: Keyword arguments for batch_resize_images
+    """
+    args = parser.parse_args(argv)
     
     # Validate arguments
-    if not args.width and not args.height:
-        parser.error("At least one of --width or --height must be specified")
+    sizes = None
+    if args.sizes:
+        try:
+            sizes = [parse_size_spec(spec) for spec in args.sizes]
+        except ValueError as e:
+            parser.error(str(e))
+    elif not args.width and not args.height:
+        parser.error("At least one of --width, --height or --sizes must be specified")
     
     if args.quality < 1 or args.quality > 100:
         parser.error("Quality must be between 1 and 100")
     
-    # Run batch resize
-    batch_resize_images(
+    if args.max_memory is not None and args.max_memory < 1:
+        parser.error("Max memory must be at least 1 MB")
+    
+    if args.frame_workers < 1:
+        parser.error("Frame workers must be at least 1")
+    
+    if args.max_kb is not None and args.max_kb < 1:
+        parser.error("Max size must be at least 1 KB")
+    
+    if args.reducing_gap is not None and args.reducing_gap < 1.0:
+        parser.error("Reducing gap must be at least 1.0")
+    
+    preset = PRESETS[args.preset or 'best']
+    resample = args.filter or preset['resample']
+    reducing_gap = (args.reducing_gap if args.reducing_gap is not None
+                    else preset['reducing_gap'])
+    
+    try:
+        background = ImageColor.getrgb(args.background)[:3]
+    except ValueError:
+        parser.error(f"Invalid background color '{args.background}'")
+    
+    return dict(
         input_folder=args.input,
         output_folder=args.output,
         width=args.width,
@@ -263,9 +3176,38 @@ Examples:
         quality=args.quality,
         output_format=args.format,
         prefix=args.prefix,
-        suffix=args.suffix
+        suffix=args.suffix,
+        workers=args.workers,
+        chunksize=args.chunksize,
+        ordered=not args.unordered,
+        plan=args.plan,
+        max_memory=args.max_memory * 1024 * 1024 if args.max_memory else None,
+        draft=not args.no_draft,
+        reducing_gap=reducing_gap,
+        sizes=sizes,
+        incremental=args.incremental,
+        cache_dir=args.cache_dir,
+        cache_max_bytes=args.cache_size * 1024 * 1024,
+        recursive=args.recursive,
+        timings=args.timings,
+        metrics_file=args.metrics_file,
+        quiet=args.quiet,
+        background=background,
+        flatten_first=not args.no_flatten_first,
+        resample=resample,
+        encode_speed=args.encode_speed,
+        max_bytes=args.max_kb * 1024 if args.max_kb else None,
+        passthrough=args.passthrough,
+        stream=args.stream,
+        animated=not args.no_animation,
+        frame_workers=args.frame_workers
     )
 
 
+def main():
+    """Main function to handle command-line arguments."""
+    batch_resize_images(**_parse_batch_options(_build_parser()))
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,101 @@
+"""
+Thin client for the image resizer daemon.
+
+Sends a batch to a running resize_daemon.py over its Unix socket and
+prints the daemon's progress and summary. Only the standard library is
+imported, so a job costs an interpreter start and a socket round trip
+instead of loading Pillow and starting worker processes every time.
+
+Example:
+  python resize_daemon.py -j 4 &
+  python resize_client.py -i photos -o thumbs -w 300 --quiet
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+
+
+# Where the daemon listens unless --socket is given
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), 'image_resizer.sock')
+
+
+def _request(socket_path, request):
+    """
+    Send one job to the daemon and yield its replies.
+
+    Args:
+        socket_path (str): Path of the daemon's Unix socket
+        request (dict): Job with 'argv' (command-line arguments as for
+            image_resizer.py) or 'options' (keyword arguments as for
+            batch_resize_images), and 'cwd' to resolve relative paths against
+
+    Yields:
+        dict: Replies as they arrive: {'line': text} for progress output,
+            then {'stats': dict} or {'error': message}
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with sock.makefile('r', encoding='utf-8') as replies:
+            for line in replies:
+                yield json.loads(line)
+
+
+def submit(input_folder, output_folder, socket_path=DEFAULT_SOCKET, **options):
+    """
+    Resize a folder on a running daemon.
+
+    Args:
+        input_folder (str): Folder containing input images
+        output_folder (str): Folder to save resized images
+        socket_path (str): Path of the daemon's Unix socket
+        **options: Keyword arguments as for batch_resize_images (JSON
+            serialisable values only; workers is set by the daemon)
+
+    Returns:
+        dict: Statistics about the operation, as from batch_resize_images
+
+    Raises:
+        ValueError: If the daemon rejected the job
+        OSError: If no daemon is listening on socket_path
+    """
+    options.update(input_folder=input_folder, output_folder=output_folder)
+    for reply in _request(socket_path, {"options": options, "cwd": os.getcwd()}):
+        if "error" in reply:
+            raise ValueError(reply["error"])
+        if "stats" in reply:
+            return reply["stats"]
+    raise ConnectionError("Daemon closed the connection without a result")
+
+
+def main():
+    """Send the command-line job to the daemon and print its output."""
+    parser = argparse.ArgumentParser(
+        description="Run an image_resizer.py batch on a running resize_daemon.py",
+        epilog="All other arguments are passed to the daemon and are the same "
+               "as for image_resizer.py (-j is set by the daemon).",
+        allow_abbrev=False)
+    parser.add_argument('--socket', default=DEFAULT_SOCKET,
+                       help=f'Daemon socket path (default: {DEFAULT_SOCKET})')
+    args, job_argv = parser.parse_known_args()
+
+    try:
+        for reply in _request(args.socket, {"argv": job_argv, "cwd": os.getcwd()}):
+            if "line" in reply:
+                print(reply["line"])
+            elif "error" in reply:
+                print(f"Error: {reply['error']}", file=sys.stderr)
+                return 2
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"Error: No resize daemon is listening on '{args.socket}' "
+              f"(start one with: python resize_daemon.py)", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
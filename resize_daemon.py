@@ -0,0 +1,241 @@
+"""
+Long-running image resizer daemon.
+
+Keeps Pillow loaded and a pool of worker processes running, and serves
+batches sent by resize_client.py over a Unix socket. A small batch then
+costs a socket round trip instead of an interpreter start, Pillow import,
+plugin registration and process pool start-up per invocation.
+
+Jobs take the same options as image_resizer.py (or, from Python, as
+batch_resize_images via resize_client.submit). Several clients may submit
+at once; their images share the warm pool.
+
+Example:
+  python resize_daemon.py -j 4 &
+  python resize_client.py -i photos -o thumbs -w 300
+"""
+
+import argparse
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from PIL import Image
+
+from image_resizer import (_build_parser, _new_stats, _parse_batch_options,
+                           _print_summary, _record_result, iter_resize_images)
+from resize_client import DEFAULT_SOCKET
+
+
+# Job options naming files, resolved against the client's working directory
+PATH_OPTIONS = ('input_folder', 'output_folder', 'cache_dir', 'metrics_file')
+
+
+def _init_worker():
+    """Prepare a worker: load every Pillow plugin and leave Ctrl+C to the daemon."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    Image.init()
+
+
+def _start_pool(workers):
+    """
+    Start a process pool and wait until every worker is running.
+
+    Args:
+        workers (int): Number of worker processes
+
+    Returns:
+        concurrent.futures.ProcessPoolExecutor: The warm pool
+    """
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+    # Each submission starts another process until the pool is full
+    for future in [executor.submit(os.getpid) for _ in range(workers)]:
+        future.result()
+    return executor
+
+
+def _raise_job_error(message):
+    """Report a bad job argument to the client instead of exiting the daemon."""
+    raise ValueError(message)
+
+
+def _job_options(request):
+    """
+    Turn a client request into batch_resize_images keyword arguments.
+
+    Args:
+        request (dict): Job from resize_client (see resize_client._request)
+
+    Returns:
+        dict: Keyword arguments for iter_resize_images, plus 'quiet',
+            'timings' and 'metrics_file'
+
+    Raises:
+        ValueError: If the arguments are invalid or the input folder is missing
+    """
+    if "argv" in request:
+        parser = _build_parser()
+        parser.error = _raise_job_error
+        options = _parse_batch_options(parser, request["argv"])
+    else:
+        options = dict(request.get("options", {}))
+        if options.get("sizes"):
+            options["sizes"] = [tuple(size) for size in options["sizes"]]
+
+    # The daemon's pool does the work
+    options.pop("workers", None)
+    options.pop("executor", None)
+
+    cwd = request.get("cwd") or os.getcwd()
+    for key in PATH_OPTIONS:
+        if options.get(key):
+            options[key] = os.path.join(cwd, options[key])
+
+    if not os.path.isdir(options.get("input_folder") or ""):
+        raise ValueError(f"Folder '{options.get('input_folder')}' does not exist.")
+    return options
+
+
+def _run_job(options, executor, workers, send):
+    """
+    Run one batch on the shared pool, sending progress to the client.
+
+    Args:
+        options (dict): Options from _job_options
+        executor (concurrent.futures.ProcessPoolExecutor): Warm pool
+        workers (int): Size of the pool
+        send (callable): Sends one reply dict to the client
+
+    Returns:
+        dict: Batch statistics, as from batch_resize_images
+    """
+    quiet = options.pop("quiet", False)
+    timings = options.pop("timings", False)
+    metrics_file = options.pop("metrics_file", None)
+    stats = _new_stats(timings or metrics_file)
+
+    # Workers print to the daemon's console, so results are reported here
+    results = iter_resize_images(workers=workers, executor=executor, quiet=True,
+                                 **options)
+    metrics_out = open(metrics_file, 'a', encoding='utf-8') if metrics_file else None
+    try:
+        for result in results:
+            _record_result(stats, result, metrics_out)
+            if not result.ok:
+                send({"line": f"✗ Error processing {result.input_path}: {result.error}"})
+            elif not quiet and result.status != 'skipped':
+                outputs = result.output_path
+                if isinstance(outputs, list):
+                    outputs = ", ".join(outputs)
+                send({"line": f"✓ {result.status.capitalize()}: "
+                              f"{os.path.basename(result.input_path)} → {outputs}"})
+    finally:
+        if metrics_out is not None:
+            metrics_out.close()
+
+    summary = io.StringIO()
+    _print_summary(stats, summary)
+    for line in summary.getvalue().splitlines():
+        send({"line": line})
+    return stats
+
+
+class _JobHandler(socketserver.StreamRequestHandler):
+    """Serve one client connection: read a job, stream back its results."""
+
+    def send(self, reply):
+        self.wfile.write(json.dumps(reply).encode('utf-8') + b'\n')
+        self.wfile.flush()
+
+    def handle(self):
+        server = self.server
+        try:
+            try:
+                options = _job_options(json.loads(self.rfile.readline()))
+                stats = _run_job(options, server.executor, server.workers, self.send)
+            except BrokenProcessPool as e:
+                # A worker died (e.g. killed for memory); replace the pool
+                # so later jobs still run
+                server.executor = _start_pool(server.workers)
+                self.send({"error": f"Worker process failed: {e}"})
+            except (ValueError, OSError) as e:
+                self.send({"error": str(e)})
+            else:
+                self.send({"stats": stats})
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client went away; the batch itself has finished
+
+
+def _socket_in_use(socket_path):
+    """Return True if a daemon is already listening on socket_path."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+def serve(socket_path=DEFAULT_SOCKET, workers=None):
+    """
+    Run the daemon until interrupted (Ctrl+C or SIGTERM).
+
+    Args:
+        socket_path (str): Unix socket to listen on
+        workers (int): Number of worker processes (0/None = all CPUs)
+
+    Raises:
+        RuntimeError: If another daemon is already listening on socket_path
+    """
+    if not workers or workers < 1:
+        workers = os.cpu_count() or 1
+
+    if os.path.exists(socket_path):
+        if _socket_in_use(socket_path):
+            raise RuntimeError(f"A daemon is already listening on '{socket_path}'")
+        os.remove(socket_path)  # Left behind by a daemon that was killed
+
+    Image.init()
+    # Start workers before the socket exists so they don't inherit it
+    executor = _start_pool(workers)
+    server = socketserver.ThreadingUnixStreamServer(socket_path, _JobHandler)
+    server.daemon_threads = True
+    server.workers = workers
+    server.executor = executor
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    print(f"Resize daemon listening on '{socket_path}' with {workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down")
+    finally:
+        server.server_close()
+        server.executor.shutdown(cancel_futures=True)
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+def main():
+    """Main function to handle command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Keep image resizer workers warm and run batches sent by "
+                    "resize_client.py")
+    parser.add_argument('--socket', default=DEFAULT_SOCKET,
+                       help=f'Unix socket to listen on (default: {DEFAULT_SOCKET})')
+    parser.add_argument('-j', '--workers', type=int, default=0,
+                       help='Number of worker processes (0 = all CPUs, default: 0)')
+    args = parser.parse_args()
+
+    try:
+        serve(args.socket, args.workers)
+    except RuntimeError as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,501 @@
+"""
+HTTP resize service.
+
+Serves resized renditions of the images under a root folder, taking the
+size and format from the URL, so the tool can sit behind a CDN as the
+origin:
+
+  GET /img/photos/cat.jpg?w=800&f=webp&q=80
+
+Query parameters: w (width), h (height), f (output format, default: the
+source format) and q (quality). Renditions are made by resize_image_bytes
+on a bounded process pool and cached in memory (LRU) and on disk.
+Concurrent requests for the same rendition share a single resize, and
+every response carries an ETag so clients and CDNs can revalidate with
+If-None-Match without the image being resized again.
+
+Example:
+  python resize_server.py --root images --port 8080 -j 4 --cache-dir .renditions
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from PIL import Image, UnidentifiedImageError
+
+from image_resizer import (DEFAULT_CACHE_MAX_BYTES, DEFAULT_ENCODE_SPEED,
+                           ENCODE_PROFILES, IMAGE_EXTENSIONS, PRESETS,
+                           SUPPORTED_OUTPUT_FORMATS, _cache_path,
+                           _calculate_dimensions, _prune_cache,
+                           resize_image_bytes)
+
+
+# Images are served from below this URL path
+URL_PREFIX = '/img/'
+
+# Largest width or height a request may ask for or produce
+MAX_DIMENSION = 8192
+
+# Largest output a request may produce (about 100 MB as RGB)
+MAX_PIXELS = 32 * 1024 * 1024
+
+# Default size limit of the in-memory rendition cache (64 MiB)
+DEFAULT_MEMORY_CACHE_BYTES = 64 * 1024 * 1024
+
+# Default Cache-Control max-age sent to clients and CDNs (1 day)
+DEFAULT_MAX_AGE = 24 * 60 * 60
+
+
+class ServiceBusy(Exception):
+    """Raised when the resize queue is full and a request must be retried."""
+
+
+def parse_params(query):
+    """
+    Turn a URL query string into resize_image_bytes arguments.
+
+    Unknown parameters are ignored, so cache-busting parameters added by
+    clients do not create new renditions.
+
+    Args:
+        query (str): Query string, e.g. 'w=800&f=webp&q=80'
+
+    Returns:
+        dict: 'width', 'height', 'output_format' and, if given, 'quality'
+
+    Raises:
+        ValueError: If a parameter is malformed or out of range, or neither
+            w nor h is given
+    """
+    values = parse_qs(query)
+
+    def integer(name, low, high):
+        if name not in values:
+            return None
+        try:
+            value = int(values[name][-1])
+        except ValueError:
+            raise ValueError(f"'{name}' must be an integer") from None
+        if not low <= value <= high:
+            raise ValueError(f"'{name}' must be between {low} and {high}")
+        return value
+
+    params = {
+        "width": integer('w', 1, MAX_DIMENSION),
+        "height": integer('h', 1, MAX_DIMENSION),
+        "output_format": None,
+    }
+    if not params["width"] and not params["height"]:
+        raise ValueError("Give a width (w) and/or height (h)")
+
+    quality = integer('q', 1, 100)
+    if quality is not None:
+        params["quality"] = quality
+
+    if 'f' in values:
+        output_format = values['f'][-1].upper()
+        output_format = 'JPEG' if output_format == 'JPG' else output_format
+        if output_format not in SUPPORTED_OUTPUT_FORMATS:
+            raise ValueError(f"'f' must be one of "
+                             f"{', '.join(SUPPORTED_OUTPUT_FORMATS).lower()}")
+        params["output_format"] = output_format
+    return params
+
+
+def _etag_matches(if_none_match, etag):
+    """Return True if an If-None-Match header value covers etag."""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag == '*' or tag.removeprefix('W/') == etag:
+            return True
+    return False
+
+
+def _render(source_path, params):
+    """Resize one source image in a worker process."""
+    with open(source_path, 'rb') as f:
+        return resize_image_bytes(f, **params)
+
+
+class ResizeService:
+    """
+    Renditions of the images under a root folder, with caching and
+    request coalescing. Thread-safe; one instance serves all requests.
+
+    Args:
+        root (str): Folder the served images live in
+        workers (int): Worker processes resizing images (0/None = all CPUs)
+        cache_dir (str): Folder for the on-disk rendition cache (None = none)
+        cache_max_bytes (int): Size limit of the on-disk cache
+        memory_cache_bytes (int): Size limit of the in-memory LRU cache
+        max_pending (int): Distinct renditions that may be queued or in
+            progress at once before requests get ServiceBusy
+            (default: 4 per worker)
+        **resize_options: Further resize_image_bytes arguments applied to
+            every rendition (e.g. resample, reducing_gap, encode_speed)
+    """
+
+    def __init__(self, root, workers=None, cache_dir=None,
+                 cache_max_bytes=DEFAULT_CACHE_MAX_BYTES,
+                 memory_cache_bytes=DEFAULT_MEMORY_CACHE_BYTES,
+                 max_pending=None, **resize_options):
+        # Load every format plugin so Image.MIME knows all output types
+        Image.init()
+        self.root = os.path.realpath(root)
+        self.workers = workers if workers and workers > 0 else os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+        self.memory_cache_bytes = memory_cache_bytes
+        self.resize_options = resize_options
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._pending = {}
+        self._slots = threading.BoundedSemaphore(max_pending or self.workers * 4)
+        self._written_since_prune = 0
+
+    def source_path(self, relative_path):
+        """
+        Resolve a URL path below URL_PREFIX to an image under the root.
+
+        Returns:
+            str: Absolute path, or None if it is outside the root, missing
+                or not an image
+        """
+        path = os.path.realpath(os.path.join(self.root, relative_path))
+        if not path.startswith(self.root + os.sep) or not os.path.isfile(path):
+            return None
+        if os.path.splitext(path)[1].lower() not in IMAGE_EXTENSIONS:
+            return None
+        return path
+
+    def prepare(self, source_path, params):
+        """
+        Work out the cache key of a rendition without resizing anything.
+
+        The key covers the source's path, size and modification time and
+        the full set of resize arguments, so it doubles as the ETag and
+        changes whenever the source is replaced.
+
+        Args:
+            source_path (str): Path from source_path
+            params (dict): Arguments from parse_params
+
+        Returns:
+            tuple: (key, output_format, params) with params completed with
+                the service's resize options and the resolved format
+
+        Raises:
+            ValueError: If the output would exceed MAX_DIMENSION or
+                MAX_PIXELS (a kept aspect ratio can stretch the other side)
+            OSError: If the source cannot be read
+            PIL.UnidentifiedImageError: If the source is not an image
+        """
+        params = dict(self.resize_options, **params)
+        with Image.open(source_path) as img:
+            source_size, source_format = img.size, img.format
+        if not params["output_format"]:
+            params["output_format"] = source_format
+
+        width, height = _calculate_dimensions(
+            source_size, params["width"], params["height"],
+            params.get("maintain_aspect", True))
+        if max(width, height) > MAX_DIMENSION or width * height > MAX_PIXELS:
+            raise ValueError(f"Output of {width}x{height} is too large "
+                             f"(at most {MAX_DIMENSION} per side and "
+                             f"{MAX_PIXELS // (1024 * 1024)} megapixels)")
+
+        stat = os.stat(source_path)
+        material = json.dumps({
+            "source": os.path.relpath(source_path, self.root),
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "params": params,
+        }, sort_keys=True)
+        key = hashlib.sha256(material.encode('utf-8')).hexdigest()
+        return key, params["output_format"], params
+
+    def rendition(self, key, output_format, source_path, params):
+        """
+        Return the encoded rendition, from cache or by resizing it.
+
+        Args:
+            key, output_format, params: As returned by prepare
+            source_path (str): Path from source_path
+
+        Returns:
+            tuple: (data, origin) where origin is 'memory', 'disk', 'miss'
+                or 'coalesced' (waited for an identical in-flight request)
+
+        Raises:
+            ServiceBusy: If max_pending renditions are already queued
+            Exception: Whatever resize_image_bytes raised
+        """
+        data, origin = self._recall(key, output_format)
+        if data is not None:
+            return data, origin
+
+        with self._lock:
+            future = self._pending.get(key)
+            owner = future is None
+            if owner:
+                if not self._slots.acquire(blocking=False):
+                    raise ServiceBusy()
+                try:
+                    future = self._submit(source_path, params)
+                except BaseException:
+                    self._slots.release()
+                    raise
+                self._pending[key] = future
+
+        if not owner:
+            return future.result(), 'coalesced'
+        try:
+            data = future.result()
+            self._remember(key, data)
+            self._store(key, output_format, data)
+        finally:
+            with self._lock:
+                del self._pending[key]
+            self._slots.release()
+        return data, 'miss'
+
+    def _submit(self, source_path, params):
+        """Queue a resize, replacing the pool if a worker has died (hold _lock)."""
+        try:
+            return self.executor.submit(_render, source_path, params)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); replace the pool so
+            # this and later requests still run
+            self.executor.shutdown(wait=False)
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self.executor.submit(_render, source_path, params)
+
+    def close(self):
+        """Stop the worker processes."""
+        self.executor.shutdown(cancel_futures=True)
+
+    def _recall(self, key, output_format):
+        """Look a rendition up in memory, then on disk."""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                return data, 'memory'
+
+        if not self.cache_dir:
+            return None, None
+        path = _cache_path(self.cache_dir, key, f"rendition.{output_format.lower()}")
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # Refresh the entry's age for least-recently-used eviction
+            os.utime(path)
+        except FileNotFoundError:
+            return None, None
+        self._remember(key, data)
+        return data, 'disk'
+
+    def _remember(self, key, data):
+        """Add a rendition to the in-memory LRU cache."""
+        if len(data) > self.memory_cache_bytes:
+            return
+        with self._lock:
+            if key in self._memory:
+                return
+            self._memory[key] = data
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.memory_cache_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    def _store(self, key, output_format, data):
+        """Write a rendition to the on-disk cache, trimming it now and then."""
+        if not self.cache_dir:
+            return
+        path = _cache_path(self.cache_dir, key, f"rendition.{output_format.lower()}")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+        # Walking the cache is costly, so only trim after writing about a
+        # tenth of its limit
+        with self._lock:
+            self._written_since_prune += len(data)
+            prune = self._written_since_prune > self.cache_max_bytes // 10
+            if prune:
+                self._written_since_prune = 0
+        if prune:
+            _prune_cache(self.cache_dir, self.cache_max_bytes)
+
+
+class _ResizeHandler(BaseHTTPRequestHandler):
+    """Answer GET and HEAD requests for renditions."""
+
+    server_version = "ImageResizer"
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _send(self, status, headers=None, body=b"", send_body=True):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body and body:
+            self.wfile.write(body)
+
+    def _fail(self, status, message, send_body, headers=None):
+        headers = dict(headers or {}, **{"Content-Type": "text/plain; charset=utf-8"})
+        self._send(status, headers, (message + "\n").encode('utf-8'), send_body)
+
+    def _respond(self, send_body):
+        service = self.server.service
+        url = urlsplit(self.path)
+        path = unquote(url.path)
+
+        source_path = None
+        if path.startswith(URL_PREFIX):
+            source_path = service.source_path(path[len(URL_PREFIX):])
+        if source_path is None:
+            return self._fail(HTTPStatus.NOT_FOUND, "Not found", send_body)
+
+        try:
+            params = parse_params(url.query)
+            key, output_format, params = service.prepare(source_path, params)
+        except ValueError as e:
+            return self._fail(HTTPStatus.BAD_REQUEST, str(e), send_body)
+        except (OSError, UnidentifiedImageError) as e:
+            return self._fail(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, str(e), send_body)
+
+        headers = {
+            "ETag": f'"{key[:32]}"',
+            "Cache-Control": f"public, max-age={self.server.max_age}",
+        }
+        if _etag_matches(self.headers.get("If-None-Match"), headers["ETag"]):
+            return self._send(HTTPStatus.NOT_MODIFIED, headers, send_body=send_body)
+
+        try:
+            data, origin = service.rendition(key, output_format, source_path, params)
+        except ServiceBusy:
+            return self._fail(HTTPStatus.SERVICE_UNAVAILABLE, "Too many pending resizes",
+                              send_body, {"Retry-After": "1"})
+        except Exception as e:
+            self.log_error("Resizing %s failed: %s", source_path, e)
+            return self._fail(HTTPStatus.INTERNAL_SERVER_ERROR, "Resize failed", send_body)
+
+        headers.update({
+            "Content-Type": Image.MIME.get(output_format, "application/octet-stream"),
+            "X-Cache": origin,
+        })
+        self._send(HTTPStatus.OK, headers, data, send_body)
+
+
+def serve(service, host='127.0.0.1', port=8080, max_age=DEFAULT_MAX_AGE,
+          quiet=False):
+    """
+    Serve a ResizeService over HTTP until interrupted.
+
+    Args:
+        service (ResizeService): Service answering the requests
+        host (str): Address to listen on
+        port (int): Port to listen on
+        max_age (int): Cache-Control max-age in seconds
+        quiet (bool): Don't log a line per request
+    """
+    server = ThreadingHTTPServer((host, port), _ResizeHandler)
+    server.service = service
+    server.max_age = max_age
+    server.quiet = quiet
+    print(f"Serving '{service.root}' on http://{host}:{server.server_port}{URL_PREFIX} "
+          f"with {service.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down")
+    finally:
+        server.server_close()
+        service.close()
+
+
+def main():
+    """Main function to handle command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Serve resized images over HTTP, e.g. "
+                    "GET /img/photo.jpg?w=800&f=webp&q=80")
+    parser.add_argument('--root', required=True,
+                       help='Folder containing the images to serve')
+    parser.add_argument('--host', default='127.0.0.1',
+                       help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080,
+                       help='Port to listen on (default: 8080)')
+    parser.add_argument('-j', '--workers', type=int, default=0,
+                       help='Number of worker processes (0 = all CPUs, default: 0)')
+    parser.add_argument('--max-pending', type=int,
+                       help='Renditions queued at once before answering 503 '
+                            '(default: 4 per worker)')
+    parser.add_argument('--cache-dir',
+                       help='Keep generated renditions in this folder')
+    parser.add_argument('--cache-size', type=int,
+                       default=DEFAULT_CACHE_MAX_BYTES // (1024 * 1024),
+                       help='Disk cache size limit in MB (default: 1024)')
+    parser.add_argument('--memory-cache', type=int,
+                       default=DEFAULT_MEMORY_CACHE_BYTES // (1024 * 1024),
+                       help='In-memory cache size limit in MB (default: 64)')
+    parser.add_argument('--max-age', type=int, default=DEFAULT_MAX_AGE,
+                       help=f'Cache-Control max-age in seconds (default: {DEFAULT_MAX_AGE})')
+    parser.add_argument('--preset', choices=list(PRESETS), default='best',
+                       help='Speed/quality preset for resampling (default: best)')
+    parser.add_argument('--encode-speed', choices=list(ENCODE_PROFILES),
+                       default=DEFAULT_ENCODE_SPEED,
+                       help='Encoder profile (default: default)')
+    parser.add_argument('--quiet', action='store_true',
+                       help='Do not log a line per request')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.root):
+        parser.error(f"Folder '{args.root}' does not exist")
+    if args.max_pending is not None and args.max_pending < 1:
+        parser.error("Max pending must be at least 1")
+
+    preset = PRESETS[args.preset]
+    service = ResizeService(
+        args.root,
+        workers=args.workers,
+        cache_dir=args.cache_dir,
+        cache_max_bytes=args.cache_size * 1024 * 1024,
+        memory_cache_bytes=args.memory_cache * 1024 * 1024,
+        max_pending=args.max_pending,
+        resample=preset['resample'],
+        reducing_gap=preset['reducing_gap'],
+        encode_speed=args.encode_speed,
+    )
+    serve(service, args.host, args.port, args.max_age, args.quiet)
+
+
+if __name__ == "__main__":
+    main()